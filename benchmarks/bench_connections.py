@@ -0,0 +1,54 @@
+"""
+Compare a fresh sqlite3 connection per operation with the pooled
+``get_connection()``.
+
+Usage: python benchmarks/bench_connections.py [operations]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from pyscrum import database
+from pyscrum.database import get_connection, init_db, close_all
+
+
+def fresh_connection(path, operations):
+    for _ in range(operations):
+        conn = sqlite3.connect(path)
+        try:
+            conn.execute("SELECT id FROM tasks WHERE id = ?", ("missing",)).fetchone()
+        finally:
+            conn.commit()
+            conn.close()
+
+
+def pooled_connection(operations):
+    for _ in range(operations):
+        with get_connection() as conn:
+            conn.execute("SELECT id FROM tasks WHERE id = ?", ("missing",)).fetchone()
+
+
+def main(operations=5000):
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "bench.db")
+        init_db()
+
+        start = time.perf_counter()
+        fresh_connection(database.DB_NAME, operations)
+        fresh = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pooled_connection(operations)
+        pooled = time.perf_counter() - start
+        close_all()
+
+    print(f"operations:         {operations}")
+    print(f"fresh connection:   {fresh / operations * 1e6:8.1f} us/op")
+    print(f"pooled connection:  {pooled / operations * 1e6:8.1f} us/op")
+    print(f"speedup:            {fresh / pooled:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,69 @@
+"""
+Measure the memory held by a full task listing with tracemalloc: Task
+objects with a per-instance __dict__ and their description (the old
+layout), slotted Task objects as Task.load_all returns them (description
+deferred), and TaskRow projections of the columns list views print.
+
+Usage: python benchmarks/bench_memory.py [tasks]
+"""
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from pyscrum import database
+from pyscrum.database import init_db, close_all
+from pyscrum.task import Task, TASK_FIELDS, ROW_FIELDS
+
+
+class DictTask:
+    """Task as it was hydrated before __slots__."""
+
+
+def dict_tasks():
+    sql, params = Task.query().compile()
+    tasks = []
+    with database.get_connection() as conn:
+        for values in conn.execute(sql, params):
+            task = DictTask()
+            task.__dict__.update(zip(TASK_FIELDS, values))
+            task._persisted = True
+            task._dirty = set()
+            tasks.append(task)
+    return tasks
+
+
+def measure(load):
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return held, peak
+
+
+def main(count=100_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "bench.db")
+        init_db()
+        Task.bulk_create(
+            {"title": f"Task number {i}", "description": "Steps to reproduce: " * 10}
+            for i in range(count)
+        )
+
+        results = {
+            "dict Task objects": measure(dict_tasks),
+            "Task.load_all()": measure(Task.load_all),
+            "TaskRow projections": measure(lambda: Task.query().rows(*ROW_FIELDS)),
+        }
+        close_all()
+
+    print(f"tasks: {count}")
+    for name, (held, peak) in results.items():
+        print(f"{name:22} {held / 2**20:7.1f} MiB held, {peak / 2**20:7.1f} MiB peak")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,75 @@
+"""
+Time substring, full-text and fuzzy task search on a synthetic database.
+
+Usage: python benchmarks/bench_search.py [tasks]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from pyscrum import database
+from pyscrum.database import init_db, close_all
+from pyscrum.task import Task
+
+WORDS = (
+    "fix login page update billing address deploy staging release notes "
+    "refactor parser cache invalidation export report sprint backlog api "
+    "timeout retry webhook migration dashboard search index flaky test"
+).split()
+
+QUERIES = ["login page", "billing", "webhook retry", "dashbord", "invalidaton cache"]
+
+
+def vocabulary(rng, size=20_000):
+    # Real backlogs have a long tail of rare words next to the common ones.
+    syllables = ["ka", "lo", "mi", "ne", "ru", "sta", "tor", "vel", "qui", "bra", "den", "fis"]
+    made_up = {"".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(size)}
+    return WORDS + sorted(made_up)
+
+
+def populate(count):
+    rng = random.Random(42)
+    words = vocabulary(rng)
+    weights = [50] * len(WORDS) + [1] * (len(words) - len(WORDS))
+    Task.bulk_create(
+        {
+            "title": " ".join(rng.choices(words, weights, k=4)),
+            "description": " ".join(rng.choices(words, weights, k=12)),
+        }
+        for _ in range(count)
+    )
+
+
+def timed(search, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            search(query)
+    return (time.perf_counter() - start) / (repeat * len(QUERIES))
+
+
+def main(count=100_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "bench.db")
+        init_db()
+        populate(count)
+
+        ranked = timed(lambda q: Task.search_ranked(q, limit=20))
+        fuzzy = timed(lambda q: Task.fuzzy_search(q, limit=10))
+        with database.get_connection() as conn:
+            for trigger in ("insert", "delete", "update"):
+                conn.execute(f"DROP TRIGGER tasks_fts_{trigger}")
+            conn.execute("DROP TABLE tasks_fts")
+        substring = timed(lambda q: Task.search_ranked(q, limit=20), repeat=1)
+        close_all()
+
+    print(f"tasks:              {count}")
+    print(f"LIKE scan:          {substring * 1e3:8.1f} ms/query")
+    print(f"FTS5 bm25:          {ranked * 1e3:8.1f} ms/query")
+    print(f"fuzzy (trigram):    {fuzzy * 1e3:8.1f} ms/query")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
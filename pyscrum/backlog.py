@@ -1,87 +1,144 @@
 import sqlite3
 from .database import get_connection
-from .task import Task
+from .members import TaskMembers
+from .task import Task, TaskRow, task_columns, PAGE_SIZE, LIST_FIELDS
 
 
 class Backlog:
     def __init__(self):
-        self.tasks = []
-        self._load_tasks()
+        self._members = TaskMembers(self._member_rows)
+
+    @property
+    def tasks(self):
+        """Backlog tasks, loaded from the database on first access."""
+        return self._members.all()
+
+    @tasks.setter
+    def tasks(self, tasks):
+        self._members.replace(tasks)
 
     @classmethod
     def load(cls):
         """Load backlog from database."""
-        backlog = cls()
-        try:
+        return cls()
+
+    @staticmethod
+    def _member_rows(conn):
+        return conn.execute(
+            f"""
+            SELECT {task_columns("t", LIST_FIELDS)}
+            FROM backlog_tasks b
+            JOIN tasks t ON t.id = b.task_id
+            ORDER BY b.rowid
+            """
+        )
+
+    def iter_tasks(self, after=None, limit=None, batch_size=PAGE_SIZE, fields=None):
+        """
+        Yield backlog tasks in the order they were added without loading
+        the whole backlog: rows are fetched ``batch_size`` at a time, keyed
+        on the backlog position. ``after`` is the ID of the last task of
+        the previous page; ``limit`` caps the number of tasks yielded.
+        With ``fields`` only those columns are fetched and ``TaskRow``s
+        are yielded.
+        """
+        position = 0
+        if after is not None:
             with get_connection() as conn:
-                cursor = conn.execute("SELECT task_id FROM backlog_tasks")
-                task_ids = [row[0] for row in cursor.fetchall()]
-                backlog.tasks = [Task.load(task_id) for task_id in task_ids]
-        except sqlite3.OperationalError:
-            pass
-        return backlog
+                row = conn.execute(
+                    "SELECT rowid FROM backlog_tasks WHERE task_id = ?", (after,)
+                ).fetchone()
+            if row is None:
+                raise ValueError(f"Unknown cursor '{after}'")
+            position = row[0]
 
-    def _load_tasks(self):
-        try:
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
             with get_connection() as conn:
-                conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS backlog_tasks (
-                        task_id TEXT PRIMARY KEY
-                    )
-                """
-                )
-                cursor = conn.execute("SELECT task_id FROM backlog_tasks")
-                task_ids = cursor.fetchall()
-                self.tasks = []
-                for task_id in task_ids:
-                    try:
-                        task = Task.load(task_id[0])
-                        self.tasks.append(task)
-                    except ValueError:
-                        pass
-        except sqlite3.OperationalError:
-            self.tasks = []
+                rows = conn.execute(
+                    f"""
+                    SELECT b.rowid, {task_columns("t", fields or LIST_FIELDS)}
+                    FROM backlog_tasks b
+                    JOIN tasks t ON t.id = b.task_id
+                    WHERE b.rowid > ?
+                    ORDER BY b.rowid
+                    LIMIT ?
+                    """,
+                    (position, size),
+                ).fetchall()
+            for row in rows:
+                if fields is not None:
+                    yield TaskRow.from_row(row[1:])
+                else:
+                    yield self._members.from_row(row[1:])
+            if len(rows) < size:
+                return
+            position = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
 
     def add_task(self, task):
         """Add a task to the backlog if it doesn't already exist."""
         if isinstance(task, str):
             task = Task(task)
 
-        # Check if task with same ID already exists
-        existing_task_ids = {t.id for t in self.tasks}
-        if task.id not in existing_task_ids:
-            self.tasks.append(task)
-            try:
-                with get_connection() as conn:
-                    conn.execute(
-                        """
-                        INSERT OR IGNORE INTO backlog_tasks (task_id)
-                        VALUES (?)
-                        """,
-                        (task.id,),
-                    )
-            except sqlite3.OperationalError:
-                pass
+        if not self._members.add(task):
+            return  # Already in the backlog
+        try:
+            with get_connection() as conn:
+                conn.execute(
+                    """
+                    INSERT OR IGNORE INTO backlog_tasks (task_id)
+                    VALUES (?)
+                    """,
+                    (task.id,),
+                )
+        except sqlite3.OperationalError:
+            pass
+
+    def add_tasks(self, records):
+        """
+        Create tasks from ``records`` and add them to the backlog in a single
+        transaction (see ``Task.bulk_create``). Returns their ``TaskHandle``s.
+        """
+        handles = Task.bulk_create(records, in_backlog=True)
+        if handles and self._members.loaded:
+            self._members.extend(Task.load_many([handle.id for handle in handles]))
+        return handles
 
     def remove_task(self, task_id):
-        for task in self.tasks:
-            if hasattr(task, "id") and task.id == task_id:
-                self.tasks.remove(task)
-                try:
-                    with get_connection() as conn:
-                        conn.execute(
-                            "DELETE FROM backlog_tasks WHERE task_id=?", (task_id,)
-                        )
-                except sqlite3.OperationalError:
-                    pass
-                return
-        raise ValueError(f"Task '{task_id}' not found in backlog")
+        loaded = self._members.loaded
+        if not self._members.remove(task_id) or not (loaded or isinstance(task_id, str)):
+            raise ValueError(f"Task '{task_id}' not found in backlog")
+        try:
+            with get_connection() as conn:
+                cursor = conn.execute(
+                    "DELETE FROM backlog_tasks WHERE task_id=?", (task_id,)
+                )
+        except sqlite3.OperationalError:
+            return
+        if not loaded and cursor.rowcount == 0:
+            raise ValueError(f"Task '{task_id}' not found in backlog")
 
     def get_task(self, task_id):
-        for task in self.tasks:
-            if hasattr(task, "id") and task.id == task_id:
-                return task
+        task = self._members.find(task_id)
+        if task is not None:
+            return task
+        if not self._members.loaded:
+            with get_connection() as conn:
+                row = conn.execute(
+                    f"""
+                    SELECT {task_columns("t")}
+                    FROM backlog_tasks b
+                    JOIN tasks t ON t.id = b.task_id
+                    WHERE b.task_id = ?
+                    """,
+                    (task_id,),
+                ).fetchone()
+            if row is None:
+                raise ValueError(f"Task '{task_id}' not found in backlog")
+            return Task.from_row(row)
         raise ValueError(f"Task '{task_id}' not found in backlog")
 
     def clear(self):
@@ -96,12 +153,16 @@ class Backlog:
         """Return list of tasks filtered by status."""
         if status not in Task.STATUS_OPTIONS:
             raise ValueError("Invalid status")
+        if not self._members.loaded:
+            return self._members.from_query(Task.query().filter(in_backlog=True, status=status))
         return [task for task in self.tasks if task.status == status]
     
     def list_by_priority(self, priority: str):
         """Return list of tasks filtered by priority."""
         if priority not in Task.PRIORITY_OPTIONS:
             raise ValueError("Invalid priority")
+        if not self._members.loaded:
+            return self._members.from_query(Task.query().filter(in_backlog=True, priority=priority))
         return [task for task in self.tasks if task.priority == priority]
 
     def find_by_tag(self, tag: str):
@@ -111,7 +172,12 @@ class Backlog:
   
     def has_task(self, task_id: str):
         """Check if a task with the given ID is in the backlog."""
-        return any(task.id == task_id for task in self.tasks)
+        if not self._members.loaded:
+            with get_connection() as conn:
+                return conn.execute(
+                    "SELECT 1 FROM backlog_tasks WHERE task_id=?", (task_id,)
+                ).fetchone() is not None
+        return self._members.find(task_id) is not None
 
     def count_by_status(self):
         """Count how many tasks are in each status."""
@@ -0,0 +1,89 @@
+import time
+import weakref
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache with an optional time-to-live.
+
+    A ``maxsize`` of 0 disables the cache: ``put`` stores nothing and
+    ``enabled`` is False, so callers can skip cache bookkeeping entirely.
+    """
+
+    def __init__(self, maxsize: int = 0, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._data_versions = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        value, stored_at = entry
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        self._data[key] = (value, time.monotonic())
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        if self._data.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def invalidate_where(self, predicate):
+        """Drop every entry whose key satisfies ``predicate``."""
+        for key in [key for key in self._data if predicate(key)]:
+            del self._data[key]
+            self.invalidations += 1
+
+    def clear(self):
+        self.invalidations += len(self._data)
+        self._data.clear()
+
+    def sync(self, conn):
+        """
+        Clear the cache if the database changed under ``conn``.
+
+        ``PRAGMA data_version`` changes whenever another connection (in this
+        or another process) commits, which in-process invalidation cannot
+        see. A connection seen for the first time clears the cache too.
+        """
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._data_versions.get(conn) != version:
+            self.clear()
+            self._data_versions[conn] = version
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._data)
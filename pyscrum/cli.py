@@ -1,6 +1,18 @@
+from typing import List
+
 import typer
-from pyscrum.database import init_db
-from pyscrum.task import Task
+from pyscrum.database import (
+    init_db,
+    set_profile,
+    profile_settings,
+    transaction,
+    compress_storage as compress_text_storage,
+    set_id_strategy,
+    get_connection,
+    PROFILE_ENV_VAR,
+)
+from pyscrum.compression import DEFAULT_THRESHOLD
+from pyscrum.task import Task, ROW_FIELDS
 from pyscrum.backlog import Backlog
 from pyscrum.sprint import Sprint
 from pyscrum.reports import (
@@ -11,6 +23,23 @@ from pyscrum.reports import (
 app = typer.Typer()
 
 
+@app.callback()
+def main(
+    profile: str = typer.Option(
+        None,
+        envvar=PROFILE_ENV_VAR,
+        help="Database performance profile (durable/balanced/fast-ephemeral)",
+    )
+):
+    """PyScrum command-line interface."""
+    if profile:
+        try:
+            set_profile(profile)
+        except ValueError as e:
+            typer.echo(f"❌ {e}")
+            raise typer.Exit(code=1)
+
+
 @app.command()
 def init():
     """Initialize the database."""
@@ -18,6 +47,56 @@ def init():
     typer.echo("✅ Database initialized.")
 
 
+@app.command()
+def db_profile():
+    """Show the active database profile and its PRAGMA values."""
+    for key, value in profile_settings().items():
+        typer.echo(f"{key}: {value}")
+
+
+def _format_size(size):
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024 or unit == "MiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+@app.command()
+def compress_storage(
+    threshold: int = typer.Option(DEFAULT_THRESHOLD, min=1, help="Compress text of at least this many bytes"),
+    disable: bool = typer.Option(False, "--disable", help="Store all text uncompressed again"),
+    vacuum: bool = typer.Option(True, "--vacuum/--no-vacuum", help="Shrink the database file afterwards"),
+):
+    """Compress stored task descriptions and comments (opt-in storage mode)."""
+    report = compress_text_storage(None if disable else threshold, vacuum=vacuum)
+    for name, (before, after) in report.items():
+        typer.echo(f"📦 {name}: {_format_size(before)} → {_format_size(after)}")
+    if disable:
+        typer.echo("✅ Text is stored uncompressed.")
+    else:
+        typer.echo(f"✅ Text of {threshold} bytes or more is stored compressed.")
+
+
+@app.command()
+def id_strategy(
+    strategy: str = typer.Argument(None, help="New task ID format (uuid4/uuid7/ulid)"),
+    rekey: bool = typer.Option(False, "--rekey", help="Also give existing tasks time-ordered IDs"),
+    vacuum: bool = typer.Option(True, "--vacuum/--no-vacuum", help="Rebuild the database file after --rekey"),
+):
+    """Show or set the format of new task IDs."""
+    if strategy:
+        try:
+            set_id_strategy(strategy)
+            if rekey:
+                count = Task.rekey(vacuum=vacuum)
+                typer.echo(f"🔑 Re-keyed {count} tasks.")
+        except ValueError as e:
+            typer.echo(f"❌ {e}")
+            raise typer.Exit(code=1)
+    with get_connection() as conn:
+        typer.echo(f"✅ New task IDs: {conn.id_strategy}")
+
+
 @app.command()
 def add_task(
     title: str,
@@ -28,23 +107,74 @@ def add_task(
     if priority not in ["low", "medium", "high"]:
         typer.echo("❌ Priority must be one of: low, medium, high")
         return
-    task = Task(title, description, priority)
-    task.save()
-    backlog = Backlog()
-    backlog.add_task(task)
+    with transaction():
+        task = Task(title, description, priority)
+        Backlog().add_task(task)
     typer.echo(f"✅ Task added: {task}")
 
 
+LIMIT_OPTION = typer.Option(None, "--limit", min=1, help="Show at most this many tasks")
+CURSOR_OPTION = typer.Option(None, "--cursor", help="Continue after this task ID")
+
+
+def _fetch_limit(limit):
+    # One extra row tells whether there is a next page.
+    return None if limit is None else limit + 1
+
+
+def _echo_page(tasks, limit, empty_message, header=None, line=lambda task: f" - {task}"):
+    """Stream tasks fetched with ``_fetch_limit`` and print the next cursor."""
+    last = None
+    for index, task in enumerate(tasks):
+        if index == 0 and header:
+            typer.echo(header)
+        if limit is not None and index == limit:
+            typer.echo(f"➡️  More tasks: --cursor {last.id}")
+            break
+        typer.echo(line(task))
+        last = task
+    if last is None:
+        typer.echo(empty_message)
+
+
 @app.command()
-def list_tasks():
+def list_tasks(
+    short_ids: bool = typer.Option(False, "--short-ids", help="Show the shortest unique ID prefixes"),
+    limit: int = LIMIT_OPTION,
+    cursor: str = CURSOR_OPTION,
+):
     """List all tasks in the backlog."""
-    backlog = Backlog()
-    if not backlog.tasks:
-        typer.echo("📭 No tasks in backlog.")
+    prefixes = Task.short_ids() if short_ids else None
+
+    def line(task):
+        if prefixes is None:
+            return f" - {task}"
+        return f" - {prefixes.get(task.id, task.id)}: {task.title} ({task.status}) [{task.priority}]"
+
+    try:
+        tasks = Backlog().iter_tasks(after=cursor, limit=_fetch_limit(limit), fields=ROW_FIELDS)
+        _echo_page(tasks, limit, "📭 No tasks in backlog.", "📋 Backlog tasks:", line)
+    except ValueError as e:
+        typer.echo(f"❌ {e}")
+
+
+@app.command()
+def purge_phantoms(
+    apply: bool = typer.Option(False, "--apply", help="Delete the listed tasks"),
+):
+    """
+    List duplicate task rows created by loading tasks in older versions;
+    with --apply, delete them. Review the list first: a real duplicate
+    task that is not in the backlog or a sprint looks the same.
+    """
+    ids = Task.purge_phantoms()
+    for task in Task.load_many(ids):
+        typer.echo(f" - {task} created {task.created_at}")
+    if not apply:
+        typer.echo(f"🔍 {len(ids)} phantom task(s) found. Run with --apply to delete them.")
         return
-    typer.echo("📋 Backlog tasks:")
-    for task in backlog.tasks:
-        typer.echo(f" - {task}")
+    ids = Task.purge_phantoms(dry_run=False)
+    typer.echo(f"🧹 Removed {len(ids)} phantom task(s).")
 
 
 @app.command()
@@ -58,13 +188,35 @@ def start_sprint(name: str):
         typer.echo(f"❌ {e}")
 
 
+def _bulk_target(task_ids, where_status, where_priority):
+    """Resolve CLI task ID prefixes or filter options for Task.bulk_update."""
+    if task_ids:
+        return [Task.load_by_prefix(task_id).id for task_id in task_ids]
+    if where_status is None and where_priority is None:
+        raise ValueError("Provide task IDs or a --where-status/--where-priority filter")
+    where = {}
+    if where_status:
+        where["status"] = where_status
+    if where_priority:
+        where["priority"] = where_priority
+    return where
+
+
 @app.command()
-def set_status(task_id: str, status: str):
-    """Set the status of a task (todo, in_progress, done)."""
+def set_status(
+    args: List[str] = typer.Argument(..., metavar="[TASK_ID]... STATUS"),
+    where_status: str = typer.Option(None, help="Update all tasks with this status"),
+    where_priority: str = typer.Option(None, help="Update all tasks with this priority"),
+):
+    """Set the status of one or more tasks (todo, in_progress, done)."""
+    *task_ids, status = args
     try:
-        task = Task.load_by_prefix(task_id)
-        task.set_status(status)
-        typer.echo(f"✅ Task {task.id} status updated to {status}")
+        target = _bulk_target(task_ids, where_status, where_priority)
+        count = Task.bulk_update(target, status=status)
+        if len(task_ids) == 1:
+            typer.echo(f"✅ Task {target[0]} status updated to {status}")
+        else:
+            typer.echo(f"✅ {count} task(s) status updated to {status}")
     except ValueError as e:
         typer.echo(f"❌ {e}")
 
@@ -81,26 +233,25 @@ def archive_sprint(name: str):
 
 
 @app.command()
-def list_backlog():
+def list_backlog(limit: int = LIMIT_OPTION, cursor: str = CURSOR_OPTION):
     """List all tasks currently in the backlog."""
-    backlog = Backlog()
-    if not backlog.tasks:
-        typer.echo("📭 Backlog is empty.")
-        return
-    typer.echo("📋 Backlog:")
-    for task in backlog.tasks:
-        typer.echo(f" - {task}")
+    try:
+        tasks = Backlog().iter_tasks(after=cursor, limit=_fetch_limit(limit), fields=ROW_FIELDS)
+        _echo_page(tasks, limit, "📭 Backlog is empty.", "📋 Backlog:")
+    except ValueError as e:
+        typer.echo(f"❌ {e}")
 
 
 @app.command()
-def list_tasks_by_status(status: str):
+def list_tasks_by_status(status: str, limit: int = LIMIT_OPTION, cursor: str = CURSOR_OPTION):
     """List all tasks filtered by status."""
-    tasks = Task.list_all(status=status)
-    if not tasks:
-        typer.echo(f"No tasks found with status '{status}'.")
-        return
-    for task in tasks:
-        typer.echo(f"- {task}")
+    try:
+        tasks = Task.iter_all(
+            status=status, after=cursor, limit=_fetch_limit(limit), fields=ROW_FIELDS
+        )
+        _echo_page(tasks, limit, f"No tasks found with status '{status}'.", line=lambda task: f"- {task}")
+    except ValueError as e:
+        typer.echo(f"❌ {e}")
 
 
 @app.command()
@@ -233,12 +384,21 @@ def sprint_stats(sprint_name: str):
         typer.echo(f"❌ {e}")
 
 @app.command()
-def set_priority(task_id: str, priority: str = typer.Option(..., help="high/medium/low")):
-    """Set task priority."""
+def set_priority(
+    task_ids: List[str] = typer.Argument(None, metavar="[TASK_ID]..."),
+    priority: str = typer.Option(..., help="high/medium/low"),
+    where_status: str = typer.Option(None, help="Update all tasks with this status"),
+    where_priority: str = typer.Option(None, help="Update all tasks with this priority"),
+):
+    """Set the priority of one or more tasks."""
+    task_ids = task_ids or []
     try:
-        task = Task.load_by_prefix(task_id)
-        task.set_priority(priority)
-        typer.echo(f"✅ Task {task.id} priority set to {priority}")
+        target = _bulk_target(task_ids, where_status, where_priority)
+        count = Task.bulk_update(target, priority=priority)
+        if len(task_ids) == 1:
+            typer.echo(f"✅ Task {target[0]} priority set to {priority}")
+        else:
+            typer.echo(f"✅ {count} task(s) priority set to {priority}")
     except ValueError as e:
         typer.echo(f"❌ {e}")
 @app.command()
@@ -260,8 +420,7 @@ def list_by_priority(priority: str):
         typer.echo("❌ Priority must be one of: low, medium, high")
         return
     
-    tasks = Task.load_all()
-    priority_tasks = [task for task in tasks if task.priority == priority]
+    priority_tasks = Task.query().filter(priority=priority).rows()
     
     if not priority_tasks:
         typer.echo(f"No tasks with priority '{priority}'")
@@ -309,11 +468,15 @@ def age_in_seconds(task_id: str):
 
 
 @app.command()
-def search_sprint_tasks(sprint_name: str, query: str):
+def search_sprint_tasks(
+    sprint_name: str,
+    query: str,
+    fuzzy: bool = typer.Option(False, "--fuzzy", help="Tolerate typos, best title matches first"),
+):
     """Search tasks in sprint by title or description (case-insensitive)."""
     try:
         sprint = Sprint.from_name(sprint_name)
-        matches = sprint.search_tasks(query)
+        matches = sprint.search_tasks(query, fuzzy=fuzzy)
         if not matches:
             typer.echo("No matching tasks found.")
             return
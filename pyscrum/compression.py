@@ -0,0 +1,37 @@
+import zlib
+
+# SQL function registered on every pooled connection; returns stored text
+# as a string whether it was compressed or not.
+SQL_FUNCTION = "pyscrum_text"
+
+# Default minimum size (UTF-8 bytes) of text worth compressing.
+DEFAULT_THRESHOLD = 1024
+
+COMPRESSION_LEVEL = 6
+
+
+def compress(text, threshold):
+    """
+    Return ``text`` as zlib-compressed UTF-8 bytes (stored as a BLOB) if it
+    is at least ``threshold`` bytes long and compression pays off;
+    otherwise, or when ``threshold`` is None, return it unchanged.
+    """
+    if threshold is None or not isinstance(text, str):
+        return text
+    data = text.encode("utf-8")
+    if len(data) < threshold:
+        return text
+    packed = zlib.compress(data, COMPRESSION_LEVEL)
+    return packed if len(packed) < len(data) else text
+
+
+def decompress(value):
+    """Return the text of a stored value; BLOBs are compressed text."""
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode("utf-8")
+    return value
+
+
+def register(conn):
+    """Make ``pyscrum_text(value)`` available to SQL on ``conn``."""
+    conn.create_function(SQL_FUNCTION, 1, decompress, deterministic=True)
@@ -1,72 +1,903 @@
+import os
 import sqlite3
+import threading
 from contextlib import contextmanager
 
+from .compression import SQL_FUNCTION, DEFAULT_THRESHOLD, compress, decompress
+from .compression import register as register_text_function
+from .ids import STRATEGIES as ID_STRATEGIES, DEFAULT_STRATEGY as DEFAULT_ID_STRATEGY
+
 DB_NAME = "pyscrum.db"
+DEFAULT_POOL_SIZE = 5
+
+PROFILE_ENV_VAR = "PYSCRUM_DB_PROFILE"
+DEFAULT_PROFILE = "durable"
+
+# PRAGMAs applied to every new connection. "durable" keeps SQLite's own
+# defaults, "balanced" lets readers run next to a writer (WAL) and only
+# fsyncs on checkpoints, "fast-ephemeral" is for throwaway databases
+# (tests, imports) where losing the last writes on a crash is fine.
+PROFILES = {
+    "durable": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "fast-ephemeral": {
+        "journal_mode": "MEMORY",
+        "synchronous": "OFF",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 1000,
+    },
+}
+
+_profile = None
+
+
+class PooledConnection(sqlite3.Connection):
+    """Connection class used by the pool (weak-referenceable, unlike the base)."""
+
+    # Text compression threshold of the database, see compress_storage().
+    compress_threshold = None
+    # Format of new task IDs, see set_id_strategy().
+    id_strategy = DEFAULT_ID_STRATEGY
+    # Callbacks to run if the open transaction rolls back, see on_rollback().
+    rollback_hooks = ()
+
+
+class ConnectionPool:
+    """
+    Keeps long-lived SQLite connections per database file.
+
+    A thread that is already inside ``get_connection()`` gets the same
+    connection back for nested calls, so model methods calling each other
+    share one connection and one commit. Idle connections are kept (up to
+    ``max_size`` per database) and reused by the next caller.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_POOL_SIZE):
+        self.max_size = max_size
+        self._reset()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._ensured = set()
+        self.stats = {"opened": 0, "reused": 0, "closed": 0}
+
+    def _check_fork(self):
+        # Connections inherited from a parent process must never be used
+        # (or closed) by the child, just forget about them.
+        if self._pid != os.getpid():
+            self._reset()
+
+    def _active(self) -> dict:
+        active = getattr(self._local, "active", None)
+        if active is None:
+            active = self._local.active = {}
+        return active
+
+    def _connect(self, path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, check_same_thread=False, factory=PooledConnection)
+        for pragma, value in PROFILES[active_profile()].items():
+            conn.execute(f"PRAGMA {pragma}={value}").fetchall()
+        register_text_function(conn)
+        conn.rollback_hooks = []
+        if (path, SCHEMA_VERSION) not in self._ensured:
+            ensure_schema(conn)
+            self._ensured.add((path, SCHEMA_VERSION))
+        conn.compress_threshold = _compress_threshold(conn)
+        conn.id_strategy = get_setting(conn, "id_strategy") or DEFAULT_ID_STRATEGY
+        self.stats["opened"] += 1
+        return conn
+
+    def acquire(self, path: str) -> sqlite3.Connection:
+        """Check out an idle connection for ``path`` or open a new one."""
+        self._check_fork()
+        with self._lock:
+            idle = self._idle.get(path)
+            if idle:
+                self.stats["reused"] += 1
+                return idle.pop()
+        return self._connect(path)
+
+    def release(self, path: str, conn: sqlite3.Connection):
+        """Return a connection to the pool, closing it if the pool is full."""
+        with self._lock:
+            if self._pid == os.getpid():
+                idle = self._idle.setdefault(path, [])
+                if len(idle) < self.max_size:
+                    idle.append(conn)
+                    return
+        conn.close()
+        self.stats["closed"] += 1
+
+    def close_all(self):
+        """Close every idle connection held by the pool."""
+        self._check_fork()
+        with self._lock:
+            idle, self._idle = self._idle, {}
+            self._ensured = set()
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+                self.stats["closed"] += 1
+
+
+_pool = ConnectionPool()
+
+
+def configure_pool(max_size: int = DEFAULT_POOL_SIZE):
+    """Set how many idle connections are kept per database file."""
+    if max_size < 0:
+        raise ValueError("Pool size cannot be negative")
+    _pool.max_size = max_size
+    with _pool._lock:
+        for idle in _pool._idle.values():
+            while len(idle) > max_size:
+                idle.pop().close()
+                _pool.stats["closed"] += 1
+
+
+def close_all():
+    """Close all pooled connections (e.g. before deleting the database file)."""
+    _pool.close_all()
+
+
+def pool_stats() -> dict:
+    """Return counters of opened, reused and closed connections."""
+    return dict(_pool.stats)
+
+
+def active_profile() -> str:
+    """
+    Return the name of the storage profile used for new connections.
+
+    Falls back to the ``PYSCRUM_DB_PROFILE`` environment variable and then
+    to ``DEFAULT_PROFILE`` when ``set_profile()`` was not called.
+    """
+    name = _profile or os.environ.get(PROFILE_ENV_VAR) or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(
+            f"Unknown database profile '{name}'. Must be one of: {', '.join(PROFILES)}"
+        )
+    return name
+
+
+def set_profile(name: str):
+    """Select a storage profile; pooled connections are reopened with it."""
+    global _profile
+    if name is not None and name not in PROFILES:
+        raise ValueError(
+            f"Unknown database profile '{name}'. Must be one of: {', '.join(PROFILES)}"
+        )
+    _profile = name
+    close_all()
+
+
+def profile_settings() -> dict:
+    """Return the active profile name and the PRAGMA values SQLite reports."""
+    settings = {"profile": active_profile()}
+    with get_connection() as conn:
+        for pragma in PROFILES[settings["profile"]]:
+            settings[pragma] = conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+    return settings
+
+
+def on_rollback(conn, callback):
+    """
+    Call ``callback()`` if the transaction open on ``conn`` is rolled back
+    (forgotten when it commits), so objects can mark what they wrote as
+    unsaved again.
+    """
+    if conn.in_transaction:
+        conn.rollback_hooks.append(callback)
+
+
+def _rolled_back(conn, since=0):
+    # Run (and drop) the hooks registered since the savepoint ``since``.
+    hooks = conn.rollback_hooks[since:]
+    del conn.rollback_hooks[since:]
+    for callback in reversed(hooks):
+        callback()
+
+
+def _db_path() -> str:
+    # Resolved on every call: a relative DB_NAME follows os.chdir().
+    return os.path.abspath(DB_NAME)
 
 
 @contextmanager
 def get_connection():
     """Context manager for database connections."""
-    conn = sqlite3.connect(DB_NAME)
+    path = _db_path()
+    _pool._check_fork()
+    active = _pool._active()
+    if path in active:
+        yield active[path]
+        return
+
+    conn = _pool.acquire(path)
+    active[path] = conn
     try:
         yield conn
     finally:
+        del active[path]
+        try:
+            conn.commit()
+            del conn.rollback_hooks[:]
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+                _rolled_back(conn)
+            _pool.release(path, conn)
+
+
+@contextmanager
+def transaction():
+    """
+    Group model operations into a single commit.
+
+    Every ``get_connection()`` call made inside the block (``Task.save``,
+    ``Sprint.save``, ``Backlog.add_task``, ...) joins the same connection,
+    so nothing is committed until the block exits. An exception rolls the
+    whole block back. Nested ``transaction()`` blocks use savepoints.
+    """
+    path = _db_path()
+    _pool._check_fork()
+    active = _pool._active()
+    if path in active:
+        conn = active[path]
+        name = f"pyscrum_sp_{id(object())}"
+        conn.execute(f"SAVEPOINT {name}")
+        mark = len(conn.rollback_hooks)
+        try:
+            yield conn
+        except BaseException:
+            conn.execute(f"ROLLBACK TO {name}")
+            conn.execute(f"RELEASE {name}")
+            _rolled_back(conn, mark)
+            raise
+        conn.execute(f"RELEASE {name}")
+        return
+
+    conn = _pool.acquire(path)
+    active[path] = conn
+    try:
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        yield conn
+    except BaseException:
+        del active[path]
+        conn.rollback()
+        _rolled_back(conn)
+        _pool.release(path, conn)
+        raise
+    del active[path]
+    try:
         conn.commit()
-        conn.close()
+        del conn.rollback_hooks[:]
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+            _rolled_back(conn)
+        _pool.release(path, conn)
 
 
-def init_db():
-    """Initialize the database schema."""
-    with get_connection() as conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS tasks (
-                id TEXT PRIMARY KEY,
-                title TEXT NOT NULL,
-                description TEXT,
-                status TEXT DEFAULT 'todo',
-                priority TEXT DEFAULT 'medium',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
+class IdentityMap:
+    """Maps ``(class, id)`` to the single in-memory object for that row."""
+
+    def __init__(self):
+        self._objects = {}
+        self.hits = 0
+
+    def get(self, cls, key):
+        obj = self._objects.get((cls, key))
+        if obj is not None:
+            self.hits += 1
+        return obj
+
+    def add(self, obj, key):
+        self._objects[(type(obj), key)] = obj
+
+    def instances(self, cls):
+        return [obj for (obj_cls, _), obj in self._objects.items() if obj_cls is cls]
+
+    def discard(self, cls, key):
+        self._objects.pop((cls, key), None)
+
+    def clear(self, cls=None):
+        if cls is None:
+            self._objects.clear()
+        else:
+            self._objects = {k: v for k, v in self._objects.items() if k[0] is not cls}
+
+    def __len__(self):
+        return len(self._objects)
+
+
+class _Session(threading.local):
+    # Class-level default: reading it needs no getattr() fallback.
+    identity_map = None
+
+
+_session = _Session()
+
+
+def current_identity_map():
+    """Return the identity map of the enclosing ``identity_map()`` block, if any."""
+    return _session.identity_map
+
+
+@contextmanager
+def identity_map():
+    """
+    Opt-in session in which every row is hydrated into one object.
+
+    Inside the block ``Task.load``, ``Backlog``, ``Sprint`` and the other
+    loaders return the instance already seen for a task ID instead of a new
+    copy, so a change made through one view is visible in all of them and
+    known tasks are not queried again. Nested blocks share the outer map.
+    """
+    current = current_identity_map()
+    if current is not None:
+        yield current
+        return
+    _session.identity_map = IdentityMap()
+    try:
+        yield _session.identity_map
+    finally:
+        _session.identity_map = None
+
+
+def _create_base_tables(conn):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT,
+            status TEXT DEFAULT 'todo',
+            priority TEXT DEFAULT 'medium',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS sprints (
-                name TEXT PRIMARY KEY,
-                status TEXT DEFAULT 'Planned',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sprints (
+            name TEXT PRIMARY KEY,
+            status TEXT DEFAULT 'Planned',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sprint_tasks (
+            sprint_name TEXT,
+            task_id TEXT,
+            PRIMARY KEY (sprint_name, task_id),
+            FOREIGN KEY (sprint_name) REFERENCES sprints(name),
+            FOREIGN KEY (task_id) REFERENCES tasks(id)
         )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS backlog_tasks (
+            task_id TEXT PRIMARY KEY,
+            FOREIGN KEY (task_id) REFERENCES tasks(id)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS task_comments (
+            id TEXT PRIMARY KEY,
+            task_id TEXT,
+            content TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (task_id) REFERENCES tasks(id)
+        )
+        """
+    )
+
+
+def fts5_available(conn) -> bool:
+    """Return True if this SQLite build ships the FTS5 extension."""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.pyscrum_fts5_probe USING fts5(x)")
+    except sqlite3.OperationalError:
+        return False
+    conn.execute("DROP TABLE temp.pyscrum_fts5_probe")
+    return True
+
+
+def trigram_tokenizer_available(conn) -> bool:
+    """Return True if FTS5 ships the trigram tokenizer (SQLite 3.34+)."""
+    try:
         conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS sprint_tasks (
-                sprint_name TEXT,
-                task_id TEXT,
-                PRIMARY KEY (sprint_name, task_id),
-                FOREIGN KEY (sprint_name) REFERENCES sprints(name),
-                FOREIGN KEY (task_id) REFERENCES tasks(id)
-            )
-            """
+            "CREATE VIRTUAL TABLE temp.pyscrum_trigram_probe USING fts5(x, tokenize='trigram')"
         )
+    except sqlite3.OperationalError:
+        return False
+    conn.execute("DROP TABLE temp.pyscrum_trigram_probe")
+    return True
+
+
+def has_table(conn, name: str) -> bool:
+    """Return True if a table (or virtual table) ``name`` exists."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def _create_task_fts(conn, compressed=False):
+    # External-content index over tasks.title/description, kept in sync by
+    # triggers. Skipped when FTS5 is missing; Task.search then uses LIKE.
+    # With compressed storage it reads descriptions through a decompressing
+    # view (see compress_storage).
+    if not fts5_available(conn):
+        return
+    if compressed:
         conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS backlog_tasks (
-                task_id TEXT PRIMARY KEY,
-                FOREIGN KEY (task_id) REFERENCES tasks(id)
-            )
+            f"""
+            CREATE VIEW IF NOT EXISTS tasks_fts_content AS
+            SELECT rowid AS task_rowid, title, {SQL_FUNCTION}(description) AS description
+            FROM tasks
             """
         )
+        content = "content='tasks_fts_content', content_rowid='task_rowid'"
+        old_text, new_text = f"{SQL_FUNCTION}(old.description)", f"{SQL_FUNCTION}(new.description)"
+    else:
+        content = "content='tasks'"
+        old_text, new_text = "old.description", "new.description"
+    conn.execute(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            title, description, {content}, prefix='2 3'
+        )
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, title, description)
+            VALUES (new.rowid, new.title, {new_text});
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+            VALUES ('delete', old.rowid, old.title, {old_text});
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_update
+        AFTER UPDATE OF title, description ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+            VALUES ('delete', old.rowid, old.title, {old_text});
+            INSERT INTO tasks_fts (rowid, title, description)
+            VALUES (new.rowid, new.title, {new_text});
+        END
+        """
+    )
+    conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+
+def _drop_task_fts(conn):
+    for trigger in ("insert", "delete", "update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS tasks_fts_{trigger}")
+    conn.execute("DROP TABLE IF EXISTS tasks_fts")
+    conn.execute("DROP VIEW IF EXISTS tasks_fts_content")
+
+
+def _create_task_trigrams(conn):
+    # Trigram index over task titles for typo-tolerant lookups; it only
+    # narrows candidates, Task.fuzzy_search scores them. Without the trigram
+    # tokenizer fuzzy search scans the titles instead.
+    if not trigram_tokenizer_available(conn):
+        return
+    conn.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_trigram USING fts5(
+            title, content='tasks', tokenize='trigram', detail='none'
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_trigram_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_trigram (rowid, title) VALUES (new.rowid, new.title);
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_trigram_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_trigram (tasks_trigram, rowid, title)
+            VALUES ('delete', old.rowid, old.title);
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_trigram_update AFTER UPDATE OF title ON tasks BEGIN
+            INSERT INTO tasks_trigram (tasks_trigram, rowid, title)
+            VALUES ('delete', old.rowid, old.title);
+            INSERT INTO tasks_trigram (rowid, title) VALUES (new.rowid, new.title);
+        END
+        """
+    )
+    conn.execute("INSERT INTO tasks_trigram (tasks_trigram) VALUES ('rebuild')")
+
+
+def _add_sprint_ids(conn):
+    # Sprints get an integer key (their old rowid, so the order is kept)
+    # and memberships reference it instead of repeating the name.
+    # AUTOINCREMENT: a deleted sprint's id is never handed to a new one.
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(sprint_tasks)")]
+    if "sprint_id" in columns:
+        return
+    conn.execute(
+        """
+        CREATE TABLE sprints_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            status TEXT DEFAULT 'Planned',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    # Sprints tables created by older Sprint.save() have no created_at.
+    sprint_columns = [row[1] for row in conn.execute("PRAGMA table_info(sprints)")]
+    created_at = "created_at" if "created_at" in sprint_columns else "CURRENT_TIMESTAMP"
+    conn.execute(
+        f"""
+        INSERT INTO sprints_new (id, name, status, created_at)
+        SELECT rowid, name, status, {created_at} FROM sprints ORDER BY rowid
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE sprint_tasks_new (
+            sprint_id INTEGER NOT NULL,
+            task_id TEXT NOT NULL,
+            PRIMARY KEY (sprint_id, task_id),
+            FOREIGN KEY (sprint_id) REFERENCES sprints(id),
+            FOREIGN KEY (task_id) REFERENCES tasks(id)
+        )
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO sprint_tasks_new (sprint_id, task_id)
+        SELECT s.id, st.task_id
+        FROM sprint_tasks st
+        JOIN sprints_new s ON s.name = st.sprint_name
+        ORDER BY st.rowid
+        """
+    )
+    conn.execute("DROP TABLE sprint_tasks")
+    conn.execute("DROP TABLE sprints")
+    conn.execute("ALTER TABLE sprints_new RENAME TO sprints")
+    conn.execute("ALTER TABLE sprint_tasks_new RENAME TO sprint_tasks")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sprint_tasks_task_id ON sprint_tasks(task_id)")
+
+
+# Ordered schema migrations. The database stores how many of them were
+# applied in PRAGMA user_version; each entry is a description and a list of
+# SQL statements or callables taking the connection. Never edit an entry
+# that was released, append a new one instead.
+MIGRATIONS = [
+    ("create base tables", [_create_base_tables]),
+    (
+        "add lookup indexes",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)",
+            "CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority)",
+            "CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_sprint_tasks_task_id ON sprint_tasks(task_id)",
+            "CREATE INDEX IF NOT EXISTS idx_task_comments_task_id ON task_comments(task_id)",
+        ],
+    ),
+    ("add full-text search index", [_create_task_fts]),
+    ("add trigram title index", [_create_task_trigrams]),
+    (
+        "add pagination index",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_tasks_created_at_id ON tasks(created_at, id)",
+            "DROP INDEX IF EXISTS idx_tasks_created_at",
+        ],
+    ),
+    (
+        "add settings table",
+        ["CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)"],
+    ),
+    ("add sprint ids", [_add_sprint_ids]),
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(conn) -> int:
+    """Return the schema version stored in the database file."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _apply_migrations(conn) -> list:
+    current = get_schema_version(conn)
+    if current > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version {current} is newer than this "
+            f"PyScrum release supports ({SCHEMA_VERSION})"
+        )
+    applied = []
+    for version in range(current, SCHEMA_VERSION):
+        description, steps = MIGRATIONS[version]
+        for step in steps:
+            if callable(step):
+                step(conn)
+            else:
+                conn.execute(step)
+        conn.execute(f"PRAGMA user_version = {version + 1}")
+        applied.append(description)
+    return applied
+
+
+def ensure_schema(conn) -> list:
+    """
+    Bring the schema of ``conn`` up to date.
+
+    The connection pool calls this once per database file and process when
+    it opens the first connection, so model methods never need their own
+    ``CREATE TABLE`` statements. Up-to-date databases cost a single PRAGMA.
+    """
+    if get_schema_version(conn) == SCHEMA_VERSION:
+        return []
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        applied = _apply_migrations(conn)
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    return applied
+
+
+def migrate() -> list:
+    """
+    Upgrade the database schema in place to ``SCHEMA_VERSION``.
+
+    Returns the descriptions of the migrations that were applied.
+    """
+    with transaction() as conn:
+        return _apply_migrations(conn)
+
+
+def init_db():
+    """Initialize the database schema."""
+    migrate()
+
+
+# Queries on the hot paths of Task, Sprint and the reports. They must be
+# answered through an index; check_query_plans() verifies that.
+HOT_QUERIES = {
+    "task by id prefix": (
+        "SELECT id FROM tasks WHERE id >= ? AND id < ? LIMIT 2",
+        ("abc", "abd"),
+    ),
+    "task page": (
+        "SELECT id FROM tasks WHERE (created_at, id) > (?, ?) ORDER BY created_at, id LIMIT 500",
+        ("2024-01-01", "x"),
+    ),
+    "tasks by status": (
+        "SELECT id FROM tasks WHERE status = ?",
+        ("todo",),
+    ),
+    "tasks by priority": (
+        "SELECT id FROM tasks WHERE priority = ?",
+        ("high",),
+    ),
+    "newest tasks": (
+        "SELECT id FROM tasks ORDER BY created_at DESC LIMIT 10",
+        (),
+    ),
+    "sprints of task": (
+        "SELECT sprint_id FROM sprint_tasks WHERE task_id = ?",
+        ("x",),
+    ),
+    "comments of task": (
+        "SELECT COUNT(*) FROM task_comments WHERE task_id = ?",
+        ("x",),
+    ),
+    "sprint report": (
+        """
+        SELECT t.id, COUNT(c.id)
+        FROM tasks t
+        JOIN sprint_tasks st ON t.id = st.task_id
+        JOIN sprints s ON s.id = st.sprint_id
+        LEFT JOIN task_comments c ON t.id = c.task_id
+        WHERE s.name = ?
+        GROUP BY t.id
+        """,
+        ("x",),
+    ),
+    "sprint statistics": (
+        """
+        SELECT t.status, COUNT(*)
+        FROM tasks t
+        JOIN sprint_tasks st ON t.id = st.task_id
+        JOIN sprints s ON s.id = st.sprint_id
+        WHERE s.name = ?
+        GROUP BY t.status
+        """,
+        ("x",),
+    ),
+}
+
+
+def explain_query_plan(sql: str, params=()) -> list:
+    """Return the detail lines of ``EXPLAIN QUERY PLAN`` for a query."""
+    with get_connection() as conn:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return [row[3] for row in rows]
+
+
+def check_query_plans() -> dict:
+    """
+    Return ``{query name: [full scan steps]}`` for every hot query that
+    still scans a whole table. An empty dict means all of them use indexes.
+    """
+    problems = {}
+    for name, (sql, params) in HOT_QUERIES.items():
+        scans = [
+            detail
+            for detail in explain_query_plan(sql, params)
+            if detail.startswith("SCAN") and "USING" not in detail
+        ]
+        if scans:
+            problems[name] = scans
+    return problems
+
+
+# Text columns compress_storage() rewrites.
+COMPRESSIBLE_COLUMNS = (("tasks", "description"), ("task_comments", "content"))
+
+
+def get_setting(conn, key):
+    """Return the stored value of setting ``key`` or None."""
+    row = conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def put_setting(conn, key, value):
+    """Store setting ``key``; None removes it."""
+    if value is None:
+        conn.execute("DELETE FROM settings WHERE key = ?", (key,))
+    else:
         conn.execute(
             """
-            CREATE TABLE IF NOT EXISTS task_comments (
-                id TEXT PRIMARY KEY,
-                task_id TEXT,
-                content TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (task_id) REFERENCES tasks(id)
-            )
-            """
+            INSERT INTO settings (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+            """,
+            (key, str(value)),
         )
+
+
+def _compress_threshold(conn):
+    value = get_setting(conn, "compress_threshold")
+    return int(value) if value is not None else None
+
+
+def storage_sizes(conn) -> dict:
+    """Return the bytes stored in each compressible column and the file."""
+    sizes = {}
+    for table, column in COMPRESSIBLE_COLUMNS:
+        sizes[f"{table}.{column}"] = conn.execute(
+            f"SELECT COALESCE(SUM(length(CAST({column} AS BLOB))), 0) FROM {table}"
+        ).fetchone()[0]
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    sizes["file"] = page_size * page_count
+    return sizes
+
+
+def _recode_column(conn, table, column, threshold, batch_size=1000):
+    last = 0
+    while True:
+        rows = conn.execute(
+            f"SELECT rowid, {column} FROM {table} WHERE rowid > ? ORDER BY rowid LIMIT ?",
+            (last, batch_size),
+        ).fetchall()
+        if not rows:
+            return
+        updates = []
+        for rowid, value in rows:
+            stored = compress(decompress(value), threshold)
+            if stored != value:
+                updates.append((stored, rowid))
+        conn.executemany(f"UPDATE {table} SET {column} = ? WHERE rowid = ?", updates)
+        last = rows[-1][0]
+
+
+def vacuum_database():
+    """Rebuild the database file, dropping free pages and fragmentation."""
+    with get_connection() as conn:
+        conn.execute("VACUUM")
+        # VACUUM may renumber the rowids the external-content indexes use.
+        for index in ("tasks_fts", "tasks_trigram"):
+            if has_table(conn, index):
+                conn.execute(f"INSERT INTO {index} ({index}) VALUES ('rebuild')")
+
+
+def compress_storage(threshold=DEFAULT_THRESHOLD, vacuum=True) -> dict:
+    """
+    Turn on compressed text storage and rewrite the existing rows.
+
+    Task descriptions and comment contents of at least ``threshold`` UTF-8
+    bytes are then stored zlib-compressed, by this call and by later
+    writes; ``threshold=None`` turns it off and decompresses every row.
+    Full-text search keeps working on the decompressed text, but the FTS
+    triggers then need the ``pyscrum_text`` SQL function, so other SQLite
+    clients can read the database but no longer write tasks.
+
+    Returns ``{name: (bytes_before, bytes_after)}`` for each column and the
+    database file (shrinks only with ``vacuum``).
+    """
+    if threshold is not None and threshold < 1:
+        raise ValueError("Compression threshold must be at least 1 byte")
+    with get_connection() as conn:
+        before = storage_sizes(conn)
+    with transaction() as conn:
+        put_setting(conn, "compress_threshold", threshold)
+        indexed = has_table(conn, "tasks_fts")
+        _drop_task_fts(conn)
+        for table, column in COMPRESSIBLE_COLUMNS:
+            _recode_column(conn, table, column, threshold)
+        if indexed:
+            _create_task_fts(conn, compressed=threshold is not None)
+        conn.compress_threshold = threshold
+    if vacuum:
+        vacuum_database()
+    with get_connection() as conn:
+        after = storage_sizes(conn)
+    close_all()  # Idle connections still have the old threshold
+    return {name: (before[name], after[name]) for name in before}
+
+
+def set_id_strategy(strategy: str):
+    """
+    Choose the format of new task IDs for the database: "uuid4" (random,
+    the default), "uuid7" or "ulid" (time-ordered, so inserts append to
+    the primary-key index). Existing IDs are kept, see ``Task.rekey()``.
+    Time-ordered IDs start with the creation time, so their unique
+    prefixes (``Task.short_ids()``) are longer.
+    """
+    if strategy not in ID_STRATEGIES:
+        raise ValueError(f"Unknown ID strategy '{strategy}', use one of: {', '.join(ID_STRATEGIES)}")
+    with transaction() as conn:
+        put_setting(conn, "id_strategy", None if strategy == DEFAULT_ID_STRATEGY else strategy)
+        conn.id_strategy = strategy
+    close_all()  # Idle connections still have the old strategy
@@ -0,0 +1,49 @@
+import re
+
+_WORD = re.compile(r"\w+")
+
+
+def words(text: str) -> list:
+    """Lowercased words of ``text``."""
+    return _WORD.findall(text.lower())
+
+
+def trigrams(text: str) -> set:
+    """
+    Trigrams of every word of ``text``, each word padded with spaces so
+    short words and word boundaries contribute too ("ab" -> " ab", "ab ").
+    """
+    grams = set()
+    for word in words(text):
+        padded = f" {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(query_grams: set, text: str) -> float:
+    """
+    Share of the query trigrams found in ``text`` (0.0 - 1.0).
+
+    Measuring against the query rather than the union keeps long titles
+    from being penalised while the user is still typing.
+    """
+    if not query_grams:
+        return 0.0
+    return len(query_grams & trigrams(text)) / len(query_grams)
+
+
+def rank(query: str, items, key, limit: int = 10, threshold: float = 0.3) -> list:
+    """
+    Return the ``limit`` best ``(item, score)`` pairs whose ``key(item)``
+    is at least ``threshold`` similar to ``query``, best first. Ties go to
+    the shorter text, i.e. the closer match.
+    """
+    query_grams = trigrams(query)
+    scored = []
+    for item in items:
+        text = key(item)
+        score = similarity(query_grams, text)
+        if score >= threshold:
+            scored.append((score, -len(text), item))
+    scored.sort(key=lambda entry: (entry[0], entry[1]), reverse=True)
+    return [(item, score) for score, _, item in scored[:limit]]
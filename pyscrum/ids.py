@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+import uuid
+
+# Task ID formats. "uuid4" is random (the historical default); "uuid7" and
+# "ulid" start with a millisecond timestamp, so new rows are appended to the
+# end of the primary-key index instead of landing on random pages. All are
+# lowercase text so prefix lookups work the same way, but the leading
+# characters of time-ordered IDs are the creation time: IDs created close
+# together share them and need longer prefixes (about 9-18 characters).
+STRATEGIES = ("uuid4", "uuid7", "ulid")
+DEFAULT_STRATEGY = "uuid4"
+
+_CROCKFORD = "0123456789abcdefghjkmnpqrstvwxyz"
+
+# Width of the counter that follows the timestamp (RFC 9562, method 1).
+# The ULID counter ends on a base32 character boundary.
+_COUNTER_BITS = {"uuid7": 12, "ulid": 15}
+
+_lock = threading.Lock()
+# strategy -> (requested millis, millis used, counter) of the last ID
+_last = {"uuid7": (0, 0, 0), "ulid": (0, 0, 0)}
+
+
+def _random_bits(bits):
+    return int.from_bytes(os.urandom((bits + 7) // 8), "big") >> (-bits % 8)
+
+
+def _clock(strategy, millis):
+    # Return (millis, counter) for the next ID. Within one millisecond the
+    # counter right after the timestamp increments, so IDs sort in creation
+    # order and differ early instead of only in their last character. It
+    # starts at a random value in the lower half of its range.
+    bits = _COUNTER_BITS[strategy]
+    with _lock:
+        last_requested, last_millis, last_counter = _last[strategy]
+        requested = millis
+        if millis is None:
+            # Never go backwards when the system clock does.
+            millis = max(time.time_ns() // 1_000_000, last_millis)
+        elif millis == last_requested:
+            millis = last_millis  # Continue a run that borrowed a millisecond
+        if millis == last_millis and last_counter + 1 < (1 << bits):
+            counter = last_counter + 1
+        else:
+            if millis == last_millis:
+                millis += 1  # Counter exhausted: borrow the next millisecond
+            counter = _random_bits(bits - 1)
+        _last[strategy] = (requested, millis, counter)
+        return millis, counter
+
+
+def uuid7(millis=None) -> str:
+    """RFC 9562 UUID version 7 as lowercase text."""
+    millis, counter = _clock("uuid7", millis)
+    value = (millis & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76 | counter << 64  # version, rand_a
+    value |= 0b10 << 62 | _random_bits(62)  # variant, rand_b
+    return str(uuid.UUID(int=value))
+
+
+def ulid(millis=None) -> str:
+    """ULID (48-bit time, counter, random bits) in lowercase Crockford base32."""
+    millis, counter = _clock("ulid", millis)
+    value = (millis & ((1 << 48) - 1)) << 80 | counter << 65 | _random_bits(65)
+    return "".join(_CROCKFORD[(value >> shift) & 31] for shift in range(125, -1, -5))
+
+
+def new_id(strategy=DEFAULT_STRATEGY, millis=None) -> str:
+    """
+    Return a new task ID of ``strategy``; time-ordered strategies use
+    ``millis`` (Unix time in milliseconds) instead of the current time.
+    """
+    if strategy == "uuid4":
+        return str(uuid.uuid4())
+    if strategy == "uuid7":
+        return uuid7(millis)
+    if strategy == "ulid":
+        return ulid(millis)
+    raise ValueError(f"Unknown ID strategy '{strategy}', use one of: {', '.join(STRATEGIES)}")
@@ -0,0 +1,86 @@
+import sqlite3
+from .database import get_connection
+from .task import Task
+
+
+class TaskMembers:
+    """
+    Tasks of a backlog or sprint, loaded from the database on first access.
+
+    ``load(conn)`` returns the member rows (``LIST_FIELDS`` layout) in
+    order. Tasks added before the load are remembered: the load and
+    queries return those instances, unsaved changes included, instead of
+    fresh copies of the rows.
+    """
+
+    def __init__(self, load, tasks=None):
+        self._load = load
+        self._tasks = tasks
+        self._added = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._tasks is not None
+
+    def all(self) -> list:
+        """Return the member list, loading it on first use."""
+        if self._tasks is None:
+            try:
+                with get_connection() as conn:
+                    self._tasks = [self.from_row(row) for row in self._load(conn)]
+            except sqlite3.OperationalError:
+                self._tasks = []
+            self._added = {}
+        return self._tasks
+
+    def held(self) -> list:
+        """Return the member instances in memory (all of them once loaded)."""
+        return list(self._added.values()) if self._tasks is None else list(self._tasks)
+
+    def replace(self, tasks):
+        """Use ``tasks`` as the loaded member list."""
+        self._tasks = tasks
+        self._added = {}
+
+    def from_row(self, row):
+        """Return the known instance for a member row or a new deferred Task."""
+        return self._added.get(row[0]) or Task.from_row(row, defer_description=True)
+
+    def from_query(self, query):
+        """Run a ``TaskQuery`` over the members, returning known instances."""
+        return [self._added.get(task.id, task) for task in query.defer_description()]
+
+    def find(self, task_id):
+        """Return the member instance held in memory for ``task_id`` or None."""
+        if self._tasks is None:
+            return self._added.get(task_id)
+        for task in self._tasks:
+            if getattr(task, "id", None) == task_id:
+                return task
+        return None
+
+    def add(self, task) -> bool:
+        """Remember ``task``; False if the loaded list already has it."""
+        if self._tasks is None:
+            self._added.setdefault(task.id, task)
+        elif self.find(task.id) is not None:
+            return False
+        else:
+            self._tasks.append(task)
+        return True
+
+    def extend(self, tasks):
+        """Append ``tasks`` (new members) to a loaded list."""
+        if self._tasks is not None:
+            self._tasks.extend(tasks)
+
+    def remove(self, task_id) -> bool:
+        """Forget ``task_id``; False if the loaded list did not have it."""
+        self._added.pop(task_id, None)
+        if self._tasks is None:
+            return True
+        task = self.find(task_id)
+        if task is None:
+            return False
+        self._tasks.remove(task)
+        return True
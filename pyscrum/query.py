@@ -0,0 +1,205 @@
+import copy
+import re
+
+from .database import get_connection, has_table
+from .compression import SQL_FUNCTION
+from .task import Task, TaskRow, TASK_FIELDS, LIST_FIELDS, ROW_FIELDS, task_columns, fts_match
+
+
+class TaskQuery:
+    """
+    Composable task query compiled to a single parameterized SQL statement.
+
+    Build one with ``Task.query()``; every method returns a new query, so a
+    partial query can be reused::
+
+        todo = Task.query().filter(status="todo")
+        todo.filter(priority="high").order_by("-created_at").limit(10).all()
+        todo.filter(sprint="Sprint 1").count()
+
+    Without ``order_by`` tasks of a sprint or the backlog keep their order
+    there, other tasks come oldest first.
+    """
+
+    def __init__(self):
+        self._conditions = []  # (sql, params) pairs joined with AND
+        self._sprint = None
+        self._backlog = None
+        self._text = None
+        self._order = []
+        self._limit = None
+        self._defer = False
+
+    def _clone(self):
+        clone = copy.copy(self)
+        clone._conditions = list(self._conditions)
+        clone._order = list(self._order)
+        return clone
+
+    def filter(self, status=None, priority=None, sprint=None, in_backlog=None,
+               created_after=None, created_before=None, text=None):
+        """
+        Narrow the query; arguments left as None add no condition.
+
+        ``status`` and ``priority`` take a value or a list of values,
+        ``sprint`` a sprint name, ``in_backlog`` True/False. The creation
+        range is ``created_after <= created_at < created_before`` (datetimes
+        or ISO strings). ``text`` must match every word of title or
+        description (full-text index when available, substrings otherwise).
+        """
+        query = self._clone()
+        for column, value in (("status", status), ("priority", priority)):
+            if value is None:
+                continue
+            values = [value] if isinstance(value, str) else list(value)
+            placeholders = ", ".join("?" * len(values))
+            query._conditions.append((f"t.{column} IN ({placeholders})", values))
+        if created_after is not None:
+            query._conditions.append(("t.created_at >= ?", [_timestamp(created_after)]))
+        if created_before is not None:
+            query._conditions.append(("t.created_at < ?", [_timestamp(created_before)]))
+        if sprint is not None:
+            query._sprint = sprint
+        if in_backlog is not None:
+            query._backlog = bool(in_backlog)
+        if text is not None:
+            query._text = text
+        return query
+
+    def where(self, sql, *params):
+        """Add a raw SQL condition on the tasks table (aliased ``t``)."""
+        query = self._clone()
+        query._conditions.append((sql, list(params)))
+        return query
+
+    def order_by(self, *fields):
+        """Order by task fields; prefix a field with '-' for descending."""
+        query = self._clone()
+        for field in fields:
+            name = field.lstrip("-")
+            if name not in TASK_FIELDS:
+                raise ValueError(f"Cannot order tasks by '{name}'")
+            query._order.append(f"t.{name} {'DESC' if field.startswith('-') else 'ASC'}")
+        return query
+
+    def limit(self, count):
+        """Return at most ``count`` tasks."""
+        query = self._clone()
+        query._limit = count
+        return query
+
+    def defer_description(self):
+        """Load tasks without their description; it is fetched on access."""
+        query = self._clone()
+        query._defer = True
+        return query
+
+    def compile(self, fields=None, conn=None):
+        """
+        Return ``(sql, params)`` for this query. The statement selects all
+        task columns in ``TASK_FIELDS`` order, NULL for those not in
+        ``fields`` (by default the description when deferred).
+        """
+        if fields is None:
+            fields = LIST_FIELDS if self._defer else TASK_FIELDS
+        select = task_columns("t", fields)
+        if conn is None:
+            with get_connection() as conn:
+                return self._compile(select, conn, ordered=True)
+        return self._compile(select, conn, ordered=True)
+
+    def _compile(self, select, conn, ordered):
+        joins = []
+        conditions = []
+        params = []
+        if self._sprint is not None:
+            joins.append(
+                "JOIN sprints s ON s.name = ?"
+                " JOIN sprint_tasks st ON st.sprint_id = s.id AND st.task_id = t.id"
+            )
+            params.append(self._sprint)
+        if self._backlog:
+            joins.append("JOIN backlog_tasks b ON b.task_id = t.id")
+        elif self._backlog is False:
+            conditions.append("NOT EXISTS (SELECT 1 FROM backlog_tasks b WHERE b.task_id = t.id)")
+        for sql, values in self._conditions:
+            conditions.append(sql)
+            params.extend(values)
+        if self._text is not None:
+            words = re.findall(r"\w+", self._text)
+            if not words:
+                conditions.append("0")
+            elif has_table(conn, "tasks_fts"):
+                conditions.append(
+                    "t.rowid IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)"
+                )
+                params.append(fts_match(words))
+            else:
+                for word in words:
+                    conditions.append(f"(t.title LIKE ? OR {SQL_FUNCTION}(t.description) LIKE ?)")
+                    params += [f"%{word}%", f"%{word}%"]
+
+        sql = f"SELECT {select} FROM tasks t"
+        if joins:
+            sql += " " + " ".join(joins)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        if ordered:
+            sql += " ORDER BY " + ", ".join(self._order or self._default_order())
+        if self._limit is not None:
+            sql += " LIMIT ?"
+            params.append(self._limit)
+        return sql, params
+
+    def _default_order(self):
+        if self._sprint is not None:
+            return ["st.rowid"]
+        if self._backlog:
+            return ["b.rowid"]
+        return ["t.created_at", "t.id"]
+
+    def __iter__(self):
+        return iter(self.all())
+
+    def all(self):
+        """Run the query and return the matching tasks."""
+        with get_connection() as conn:
+            sql, params = self.compile(conn=conn)
+            return [
+                Task.from_row(row, defer_description=self._defer)
+                for row in conn.execute(sql, params)
+            ]
+
+    def rows(self, *fields):
+        """
+        Run the query fetching only ``fields`` (default ``ROW_FIELDS``) and
+        return immutable ``TaskRow`` projections instead of tasks.
+        """
+        with get_connection() as conn:
+            sql, params = self.compile(fields or ROW_FIELDS, conn)
+            return list(map(TaskRow.from_row, conn.execute(sql, params)))
+
+    def first(self):
+        """Return the first matching task or None."""
+        tasks = self.limit(1).all()
+        return tasks[0] if tasks else None
+
+    def count(self):
+        """Return the number of matching tasks."""
+        with get_connection() as conn:
+            if self._limit is None:
+                sql, params = self._compile("COUNT(*)", conn, ordered=False)
+            else:
+                sql, params = self._compile("1", conn, ordered=False)
+                sql = f"SELECT COUNT(*) FROM ({sql})"
+            return conn.execute(sql, params).fetchone()[0]
+
+    def exists(self):
+        """Return True if at least one task matches."""
+        with get_connection() as conn:
+            sql, params = self.limit(1)._compile("1", conn, ordered=False)
+            return conn.execute(f"SELECT EXISTS ({sql})", params).fetchone()[0] == 1
+
+
+def _timestamp(value):
+    return value if isinstance(value, str) else value.isoformat()
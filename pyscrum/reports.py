@@ -24,7 +24,7 @@ def export_tasks_to_csv(filename: str = "tasks_report.csv") -> None:
         with get_connection() as conn:
             cursor = conn.execute(
                 """
-                SELECT id, title, description, status, priority,
+                SELECT id, title, pyscrum_text(description), status, priority,
                        created_at, updated_at
                 FROM tasks
                 ORDER BY created_at DESC
@@ -73,7 +73,7 @@ def export_sprint_report_to_csv(
                 SELECT 
                     t.id,
                     t.title,
-                    t.description,
+                    pyscrum_text(t.description) AS description,
                     t.status,
                     t.priority,
                     t.created_at,
@@ -81,8 +81,9 @@ def export_sprint_report_to_csv(
                     COUNT(c.id) as comments
                 FROM tasks t
                 JOIN sprint_tasks st ON t.id = st.task_id
+                JOIN sprints s ON s.id = st.sprint_id
                 LEFT JOIN task_comments c ON t.id = c.task_id
-                WHERE st.sprint_name = ?
+                WHERE s.name = ?
                 GROUP BY t.id
                 ORDER BY t.status, t.created_at
                 """,
@@ -120,7 +121,7 @@ def export_tasks_to_html(filename: str = "tasks_report.html") -> None:
                 SELECT 
                     t.id,
                     t.title,
-                    t.description,
+                    pyscrum_text(t.description) AS description,
                     t.status,
                     t.priority,
                     t.created_at,
@@ -174,7 +175,7 @@ def export_sprint_report_to_html(
                 SELECT 
                     t.id,
                     t.title,
-                    t.description,
+                    pyscrum_text(t.description) AS description,
                     t.status,
                     t.priority,
                     t.created_at,
@@ -182,8 +183,9 @@ def export_sprint_report_to_html(
                     COUNT(c.id) as comments
                 FROM tasks t
                 JOIN sprint_tasks st ON t.id = st.task_id
+                JOIN sprints s ON s.id = st.sprint_id
                 LEFT JOIN task_comments c ON t.id = c.task_id
-                WHERE st.sprint_name = ?
+                WHERE s.name = ?
                 GROUP BY t.id
                 ORDER BY t.status, t.created_at
                 """,
@@ -237,7 +239,8 @@ def _get_sprint_statistics(sprint_name: str) -> dict:
                 COUNT(*) as count
             FROM tasks t
             JOIN sprint_tasks st ON t.id = st.task_id
-            WHERE st.sprint_name = ?
+            JOIN sprints s ON s.id = st.sprint_id
+            WHERE s.name = ?
             GROUP BY t.status
             """,
             (sprint_name,)
@@ -1,7 +1,21 @@
 import sqlite3
 from datetime import datetime
+from typing import NamedTuple
 from .database import get_connection
-from .task import Task
+from .fuzzy import rank as rank_fuzzy
+from .members import TaskMembers
+from .task import Task, task_columns, LIST_FIELDS
+
+
+class SprintHeader(NamedTuple):
+    """Sprint summary returned by ``Sprint.list_all(headers_only=True)``."""
+
+    name: str
+    status: str
+    total: int
+    todo: int
+    in_progress: int
+    done: int
 
 
 class Sprint:
@@ -24,10 +38,30 @@ class Sprint:
         is_valid, error_message = self.validate_name(name)
         if not is_valid:
             raise ValueError(error_message)
+        self.id = None  # Integer key of the sprints row, once it is stored
         self.name = name
         self._status = "Planned"  # Use private attribute
-        self.tasks = []
-        self._load_tasks()
+        self._members = TaskMembers(self._member_rows)
+        self._reset_changes(saved_status=None)
+
+    def _reset_changes(self, saved_status):
+        # Membership changes not yet written by save(), and the status the
+        # sprints row has in the database (None if it was never saved).
+        self._pending_add = {}
+        self._pending_remove = set()
+        self._saved_status = saved_status
+
+    @property
+    def tasks(self):
+        """Tasks of the sprint, loaded from the database on first access."""
+        return self._members.all()
+
+    @tasks.setter
+    def tasks(self, tasks):
+        self._members.replace(tasks)
+        # Like before, save() links every task of an assigned list.
+        for task in tasks:
+            self._pending_add[task.id] = task
 
     @property
     def status(self):
@@ -40,75 +74,96 @@ class Sprint:
         self._status = value
         self.save()
 
-    def _load_tasks(self):
-        """Load tasks assigned to this sprint from the database."""
-        try:
-            with get_connection() as conn:
-                conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS sprint_tasks (
-                        sprint_name TEXT,
-                        task_id TEXT,
-                        PRIMARY KEY (sprint_name, task_id)
-                    )
-                """
-                )
-                cursor = conn.execute(
-                    """
-                    SELECT task_id FROM sprint_tasks WHERE sprint_name=?
-                """,
-                    (self.name,),
-                )
-                task_ids = cursor.fetchall()
-                self.tasks = []
-                for task_id in task_ids:
-                    try:
-                        task = Task.load(task_id[0])
-                        self.tasks.append(task)
-                    except ValueError:
-                        pass
-        except sqlite3.OperationalError:
-            self.tasks = []
+    def _sprint_id(self, conn):
+        """
+        Look up the integer key of the sprint (None if it is not stored).
+        Writes use the fresh value, never a cached one: the row may have
+        been deleted, or its insert rolled back, since it was last seen.
+        """
+        row = conn.execute("SELECT id FROM sprints WHERE name=?", (self.name,)).fetchone()
+        if row is None:
+            self.id = None
+            self._saved_status = None
+            return None
+        self.id = row[0]
+        return self.id
+
+    def _member_rows(self, conn):
+        return conn.execute(
+            f"""
+            SELECT {task_columns("t", LIST_FIELDS)}
+            FROM sprint_tasks st
+            JOIN tasks t ON t.id = st.task_id
+            WHERE st.sprint_id = (SELECT id FROM sprints WHERE name = ?)
+            ORDER BY st.rowid
+            """,
+            (self.name,),
+        )
 
     def save(self):
-        """Persist the sprint and task assignments to the database."""
+        """
+        Persist the sprint and task assignments to the database.
+
+        Only what changed since the last save is written: the sprints row
+        when the status changed, and the memberships added or removed. If
+        the row is missing (new sprint, or deleted or rolled back since),
+        it is written again with every member held in memory.
+        """
         try:
             with get_connection() as conn:
-                conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS sprints (
-                        name TEXT PRIMARY KEY,
-                        status TEXT DEFAULT 'Planned'
-                    )
-                """
-                )
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO sprints (name, status)
-                    VALUES (?, ?)
-                """,
-                    (self.name, self.status),
-                )
-                for task in self.tasks:
+                sprint_id = self._sprint_id(conn)
+                if sprint_id is None or self._saved_status != self._status:
                     conn.execute(
                         """
-                        INSERT OR IGNORE INTO sprint_tasks (sprint_name, task_id)
-                        VALUES (?, ?)
+                        INSERT INTO sprints (name, status) VALUES (?, ?)
+                        ON CONFLICT(name) DO UPDATE SET status = excluded.status
                     """,
-                        (self.name, task.id),
+                        (self.name, self._status),
                     )
+                    self._saved_status = self._status
+                    if sprint_id is None:
+                        held = {task.id: task for task in self._members.held()}
+                        self._pending_add = held | self._pending_add
+                        sprint_id = self._sprint_id(conn)
+                self._flush_memberships(conn, sprint_id)
         except sqlite3.OperationalError:
             pass
 
+    def _flush_memberships(self, conn, sprint_id):
+        """
+        Write the task links added and removed since the last flush to the
+        sprints row ``sprint_id`` (just looked up on ``conn``).
+        """
+        if sprint_id is None:
+            # Not stored: nothing to remove, adds wait for save().
+            self._pending_remove = set()
+            return
+        if self._pending_add:
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO sprint_tasks (sprint_id, task_id)
+                VALUES (?, ?)
+            """,
+                [(sprint_id, task_id) for task_id in self._pending_add],
+            )
+        if self._pending_remove:
+            conn.executemany(
+                "DELETE FROM sprint_tasks WHERE sprint_id=? AND task_id=?",
+                [(sprint_id, task_id) for task_id in self._pending_remove],
+            )
+        self._pending_add = {}
+        self._pending_remove = set()
+
     def add_task(self, task):
         """Add a Task to the sprint."""
         if not isinstance(task, Task):
             raise TypeError("Sprint accepts only Task instances.")
 
-        if any(t.id == task.id for t in self.tasks):
+        if not self._members.add(task):
             return  # Avoid duplicates
+        self._pending_add[task.id] = task
+        self._pending_remove.discard(task.id)
 
-        self.tasks.append(task)
         try:
             task.save()
             self.save()
@@ -118,15 +173,12 @@ class Sprint:
     def remove_task(self, task_or_id):
         """Remove a Task by object or ID."""
         task_id = task_or_id.id if hasattr(task_or_id, "id") else task_or_id
-        self.tasks = [task for task in self.tasks if task.id != task_id]
+        self._members.remove(task_id)
+        self._pending_add.pop(task_id, None)
+        self._pending_remove.add(task_id)
         try:
             with get_connection() as conn:
-                conn.execute(
-                    """
-                    DELETE FROM sprint_tasks WHERE sprint_name=? AND task_id=?
-                """,
-                    (self.name, task_id),
-                )
+                self._flush_memberships(conn, self._sprint_id(conn))
         except sqlite3.OperationalError:
             pass
 
@@ -149,21 +201,17 @@ class Sprint:
         self.save()
 
     def update_name(self, new_name):
-        """Update the sprint name in the DB and memory."""
-        old_name = self.name
+        """
+        Update the sprint name in the DB and memory. Memberships reference
+        the sprint's integer key, so only the sprints row changes.
+        """
         try:
             with get_connection() as conn:
                 conn.execute(
                     """
                     UPDATE sprints SET name=? WHERE name=?
                 """,
-                    (new_name, old_name),
-                )
-                conn.execute(
-                    """
-                    UPDATE sprint_tasks SET sprint_name=? WHERE sprint_name=?
-                """,
-                    (new_name, old_name),
+                    (new_name, self.name),
                 )
             self.name = new_name  # Update in-memory only after DB update succeeds
         except (sqlite3.OperationalError, sqlite3.IntegrityError):
@@ -178,7 +226,10 @@ class Sprint:
         """Delete a sprint from the database, including its tasks from the sprint_tasks table."""
         try:
             with get_connection() as conn:
-                conn.execute("DELETE FROM sprint_tasks WHERE sprint_name=?", (name,))
+                conn.execute(
+                    "DELETE FROM sprint_tasks WHERE sprint_id = (SELECT id FROM sprints WHERE name=?)",
+                    (name,),
+                )
                 conn.execute("DELETE FROM sprints WHERE name=?", (name,))
         except sqlite3.OperationalError:
             pass
@@ -189,18 +240,14 @@ class Sprint:
         try:
             with get_connection() as conn:
                 cursor = conn.execute(
-                    "SELECT name, status FROM sprints WHERE name=?", (name,)
+                    "SELECT id, name, status FROM sprints WHERE name=?", (name,)
                 )
                 row = cursor.fetchone()
                 if not row:
                     raise ValueError(f"Sprint '{name}' not found.")
 
-                # Create a new Sprint instance with the loaded name
-                sprint = cls(row[0])
-                sprint.status = row[1]
-                sprint._load_tasks()  # Load tasks from DB
-
-                return sprint
+                # Tasks are loaded on first access of sprint.tasks
+                return cls._hydrate(*row)
         except sqlite3.OperationalError as e:
             raise RuntimeError(f"Database error while loading sprint '{name}': {e}")
 
@@ -209,6 +256,7 @@ class Sprint:
         filtered = [task for task in self.tasks if task.status == status]
 
         if export_to:
+            Task.prefetch_descriptions(filtered)
             from pathlib import Path
             from html import escape
 
@@ -267,6 +315,8 @@ class Sprint:
     
     def get_tasks_by_priority(self, priority):
         """Get tasks with specified priority."""
+        if not self._members.loaded:
+            return self._members.from_query(Task.query().filter(sprint=self.name, priority=priority))
         return [task for task in self.tasks if task.priority == priority]
 
     @classmethod
@@ -277,7 +327,7 @@ class Sprint:
 
         with get_connection() as conn:
             cursor = conn.execute(
-                "SELECT name, status FROM sprints WHERE name LIKE ?", (f"{prefix}%",)
+                "SELECT id, name, status FROM sprints WHERE name LIKE ?", (f"{prefix}%",)
             )
             rows = cursor.fetchall()
             if not rows:
@@ -285,43 +335,86 @@ class Sprint:
             if len(rows) > 1:
                 raise ValueError("Multiple sprints match the prefix.")
 
-            name, status = rows[0]
-            sprint = cls(name)
-            sprint.status = status
-            sprint._load_tasks()
-            return sprint
+            return cls._hydrate(*rows[0])
+
+    @classmethod
+    def _hydrate(cls, sprint_id, name, status, tasks=None):
+        """
+        Build a Sprint from stored values without querying or saving.
+        Without ``tasks`` they are loaded lazily on first access.
+        """
+        sprint = cls.__new__(cls)
+        sprint.id = sprint_id
+        sprint.name = name
+        sprint._status = status
+        sprint._members = TaskMembers(sprint._member_rows, tasks)
+        sprint._reset_changes(saved_status=status)
+        return sprint
 
     @classmethod
-    def list_all(cls):
-        """Return a list of all Sprint instances stored in the database."""
+    def list_all(cls, headers_only=False):
+        """
+        Return a list of all Sprint instances stored in the database.
+
+        Sprints and their task memberships are fetched with two queries. With
+        ``headers_only=True`` a list of ``SprintHeader`` (name, status and
+        task counts) is returned instead, without hydrating any task.
+        """
         sprints = []
         try:
             with get_connection() as conn:
-                # Ensure tables exist
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS sprints (
-                        name TEXT PRIMARY KEY,
-                        status TEXT DEFAULT 'Planned'
+                if headers_only:
+                    cursor = conn.execute(
+                        """
+                        SELECT s.name, s.status, COUNT(t.id),
+                               COALESCE(SUM(t.status = 'todo'), 0),
+                               COALESCE(SUM(t.status = 'in_progress'), 0),
+                               COALESCE(SUM(t.status = 'done'), 0)
+                        FROM sprints s
+                        LEFT JOIN sprint_tasks st ON st.sprint_id = s.id
+                        LEFT JOIN tasks t ON t.id = st.task_id
+                        GROUP BY s.id
+                        ORDER BY s.id
+                        """
                     )
-                """)
-                
-                cursor = conn.execute("SELECT name, status FROM sprints")
-                for row in cursor.fetchall():
-                    sprint = cls(row[0])
-                    sprint.status = row[1]
-                    sprint._load_tasks()
-                    sprints.append(sprint)
+                    return [SprintHeader(*row) for row in cursor]
+
+                rows = conn.execute(
+                    "SELECT id, name, status FROM sprints ORDER BY id"
+                ).fetchall()
+                members = {sprint_id: [] for sprint_id, _, _ in rows}
+                cursor = conn.execute(
+                    f"""
+                    SELECT st.sprint_id, {task_columns("t", LIST_FIELDS)}
+                    FROM sprint_tasks st
+                    JOIN tasks t ON t.id = st.task_id
+                    ORDER BY st.rowid
+                    """
+                )
+                for row in cursor:
+                    if row[0] in members:
+                        members[row[0]].append(Task.from_row(row[1:], defer_description=True))
+                sprints = [
+                    cls._hydrate(sprint_id, name, status, members[sprint_id])
+                    for sprint_id, name, status in rows
+                ]
         except sqlite3.OperationalError:
             pass
         return sprints
     
-    def search_tasks(self, query: str) -> list[Task]:
+    def search_tasks(self, query: str, fuzzy: bool = False, limit: int = 10) -> list[Task]:
         """
         Vyhľadá všetky úlohy v tomto sprinte,
         ktorých názov alebo popis obsahuje zadaný reťazec (case‑insensitive).
+        S ``fuzzy=True`` toleruje preklepy a vráti najviac ``limit``
+        úloh s najpodobnejším názvom (trigramová podobnosť).
         Vracia zoznam Task objektov.
         """
+        if fuzzy:
+            ranked = rank_fuzzy(query, self.tasks, key=lambda task: task.title, limit=limit)
+            return [task for task, _ in ranked]
         q = query.lower()
+        Task.prefetch_descriptions(self.tasks)
         return [
             task
             for task in self.tasks
@@ -1,58 +1,544 @@
-import uuid
+import re
+import sqlite3
 from datetime import datetime
-from .database import get_connection
+from itertools import islice
+from typing import NamedTuple
+from . import fuzzy
+from .cache import LRUCache
+from .compression import SQL_FUNCTION, compress, decompress
+from .database import (
+    get_connection,
+    transaction,
+    current_identity_map,
+    has_table,
+    vacuum_database,
+    on_rollback,
+)
+from .ids import new_id
+
+# Column order expected by Task.from_row().
+TASK_FIELDS = ("id", "title", "description", "status", "priority", "created_at", "updated_at")
+TASK_COLUMNS = ", ".join(TASK_FIELDS)
+
+# Columns list paths load; the (large) description is fetched on access.
+LIST_FIELDS = tuple(field for field in TASK_FIELDS if field != "description")
+
+# Placeholder of a description that was not loaded yet.
+_DEFERRED = object()
+
+# Stay below SQLITE_MAX_VARIABLE_NUMBER of old SQLite builds (999).
+MAX_QUERY_PARAMS = 900
+
+# Rows written per executemany() call by Task.bulk_create().
+BULK_BATCH_SIZE = 1000
+
+# Rows fetched per query by the streaming iterators (Task.iter_all, ...).
+PAGE_SIZE = 500
+
+
+def task_columns(alias, fields=TASK_FIELDS):
+    """
+    Return ``TASK_COLUMNS`` qualified with a table alias, for joins. Columns
+    not in ``fields`` are selected as NULL, keeping the row layout.
+    """
+    for field in fields:
+        if field not in TASK_FIELDS:
+            raise ValueError(f"Unknown task field '{field}'")
+    return ", ".join(
+        f"{alias}.{field}" if field in fields else "NULL" for field in TASK_FIELDS
+    )
+
+
+class TaskHandle(NamedTuple):
+    """Reference to a task created by ``Task.bulk_create``."""
+
+    id: str
+    title: str
+
+
+# Fields whose changes Task.save() writes with a narrow UPDATE.
+TRACKED_FIELDS = ("title", "description", "status", "priority", "created_at")
+
+_write_stats = {"inserts": 0, "updates": 0, "skipped": 0}
+
+# Read cache for Task.load/load_by_prefix, disabled until configure_cache().
+# Keys are ("id", task_id) -> row and ("prefix", prefix) -> task_id.
+_cache = LRUCache(maxsize=0)
+
+
+def _invalidate_prefixes():
+    # New or deleted rows can make a cached prefix ambiguous or stale.
+    _cache.invalidate_where(lambda key: key[0] == "prefix")
+
+
+def id_prefix_range(prefix):
+    """
+    Return ``(low, high)`` so that ``id >= low AND id < high`` matches the
+    IDs starting with ``prefix``. Unlike ``LIKE``, the range can use the
+    primary-key index. Generated IDs are lowercase, so is the prefix.
+    """
+    prefix = prefix.lower()
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _millis(timestamp):
+    # created_at as Unix milliseconds for time-ordered IDs (None: now).
+    try:
+        return int(datetime.fromisoformat(timestamp).timestamp() * 1000)
+    except (TypeError, ValueError):
+        return None
+
+
+def fts_match(words, phrase=False, prefix=True):
+    """
+    Build an FTS5 MATCH expression requiring every word (or, with
+    ``phrase``, the words in order); ``prefix`` lets the last word of a
+    phrase, or each single word, match as a prefix.
+    """
+    star = "*" if prefix else ""
+    if phrase:
+        return '"' + " ".join(words) + '"' + star
+    return " ".join(f'"{word}"{star}' for word in words)
+
+
+class TaskRow(NamedTuple):
+    """
+    Read-only projection of a task row, e.g. from ``TaskQuery.rows``.
+    Columns that were not requested are None.
+    """
+
+    id: str = None
+    title: str = None
+    description: str = None
+    status: str = None
+    priority: str = None
+    created_at: str = None
+    updated_at: str = None
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a TaskRow from a row of ``task_columns()``."""
+        if type(row[2]) is bytes:
+            return cls._make(row[:2] + (decompress(row[2]),) + tuple(row[3:]))
+        return cls._make(row)
+
+    def __str__(self):
+        return f"<Task {self.id}: {self.title} ({self.status}) [{self.priority}]>"
+
+
+# Columns list views print (see Task.__repr__) plus the pagination key.
+ROW_FIELDS = ("id", "title", "status", "priority", "created_at")
+
+
+class SearchHit(NamedTuple):
+    """Result of ``Task.search_ranked``; a lower ``score`` is a better match."""
+
+    task: "Task"
+    score: float
+    snippet: str
+
+
+class FuzzyHit(NamedTuple):
+    """Result of ``Task.fuzzy_search``; ``similarity`` is 0.0 - 1.0."""
+
+    task: "Task"
+    similarity: float
+
+
+# Seconds between the two timestamps of a phantom row (see
+# Task.purge_phantoms): the old Task.load set them in one save.
+PHANTOM_SAVE_GAP = 0.1
+
+# How many index candidates fuzzy_search scores per requested result.
+FUZZY_CANDIDATES_PER_HIT = 20
 
 
 class Task:
+    # No per-instance __dict__: large listings hydrate many tasks.
+    __slots__ = LIST_FIELDS + ("_description", "tags", "_persisted", "_dirty")
+
     STATUS_OPTIONS = {"todo", "in_progress", "done"}
     PRIORITY_OPTIONS = {"high", "medium", "low"}
 
     def __init__(self, title, description="", priority="medium"):
-        self.id = str(uuid.uuid4())
-        self.title = title
-        self.description = description
-        self.status = "todo"
-        self.priority = priority
-        self.created_at = datetime.now().isoformat()
-        self.updated_at = datetime.now().isoformat()
+        # A new task is written whole, so skip the tracking in __setattr__.
+        set_field = object.__setattr__
+        set_field(self, "_persisted", False)
+        set_field(self, "_dirty", ())
+        with get_connection() as conn:
+            set_field(self, "id", new_id(conn.id_strategy))
+        set_field(self, "title", title)
+        set_field(self, "_description", description)
+        set_field(self, "status", "todo")
+        set_field(self, "priority", priority)
+        set_field(self, "created_at", datetime.now().isoformat())
+        set_field(self, "updated_at", datetime.now().isoformat())
         self.save()
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            identity_map.add(self, self.id)
+
+    def __setattr__(self, name, value):
+        # __init__ and from_row set every slot directly, so all are set here.
+        if name in TRACKED_FIELDS:
+            # Compare with the stored value; a deferred description counts as changed.
+            current = self._description if name == "description" else getattr(self, name)
+            if current is _DEFERRED or current != value:
+                if self._dirty == ():
+                    # Clean tasks share the empty tuple until a field changes.
+                    object.__setattr__(self, "_dirty", {name})
+                else:
+                    self._dirty.add(name)
+        elif name == "id" and self._persisted:
+            # A different id is a different row: write all of it.
+            if self._description is _DEFERRED:
+                Task.prefetch_descriptions([self])
+            object.__setattr__(self, "_persisted", False)
+        object.__setattr__(self, name, value)
+
+    @property
+    def description(self):
+        """Task description; fetched on first access if it was not loaded."""
+        if self._description is _DEFERRED:
+            Task.prefetch_descriptions([self])
+        return self._description
+
+    @description.setter
+    def description(self, value):
+        self._description = value
+
+    @staticmethod
+    def prefetch_descriptions(tasks):
+        """
+        Load the descriptions of all ``tasks`` that were loaded without one
+        with chunked ``IN (...)`` queries instead of one query per task.
+        """
+        pending = {}
+        for task in tasks:
+            if task._description is _DEFERRED:
+                pending.setdefault(task.id, []).append(task)
+        task_ids = list(pending)
+        with get_connection() as conn:
+            for start in range(0, len(task_ids), MAX_QUERY_PARAMS):
+                chunk = task_ids[start:start + MAX_QUERY_PARAMS]
+                placeholders = ", ".join("?" * len(chunk))
+                for task_id, description in conn.execute(
+                    f"SELECT id, description FROM tasks WHERE id IN ({placeholders})", chunk
+                ):
+                    for task in pending.pop(task_id):
+                        object.__setattr__(task, "_description", decompress(description))
+        for orphans in pending.values():  # Row deleted meanwhile
+            for task in orphans:
+                object.__setattr__(task, "_description", "")
 
     def save(self):
-        """Persist task to database."""
+        """
+        Persist task to database.
+
+        New tasks are inserted; loaded tasks only write the fields changed
+        since they were loaded or last saved, and nothing if none changed.
+        """
+        dirty = self._dirty
+        if self._persisted and not dirty:
+            _write_stats["skipped"] += 1
+            return
+
         self.updated_at = datetime.now().isoformat()
-        
         with get_connection() as conn:
+            if self._persisted:
+                columns = [field for field in TRACKED_FIELDS if field in dirty]
+                updated = conn.execute(
+                    f"""
+                    UPDATE tasks SET {", ".join(f"{c} = ?" for c in columns)}, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    [
+                        compress(self.description, conn.compress_threshold)
+                        if c == "description" else getattr(self, c)
+                        for c in columns
+                    ] + [self.updated_at, self.id],
+                ).rowcount
+                if updated:
+                    _write_stats["updates"] += 1
+                    _cache.invalidate(("id", self.id))
+                    self._dirty = ()
+                    on_rollback(conn, self._mark_unsaved)
+                    return
             conn.execute(
-                """
-                INSERT OR REPLACE INTO tasks 
-                (id, title, description, status, priority, created_at, updated_at) 
+                f"""
+                INSERT INTO tasks ({TASK_COLUMNS})
                 VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    title = excluded.title,
+                    description = excluded.description,
+                    status = excluded.status,
+                    priority = excluded.priority,
+                    created_at = excluded.created_at,
+                    updated_at = excluded.updated_at
                 """,
-                (self.id, self.title, self.description, self.status, 
-                 self.priority, self.created_at, self.updated_at),
+                (self.id, self.title, compress(self.description, conn.compress_threshold),
+                 self.status, self.priority, self.created_at, self.updated_at),
             )
+            on_rollback(conn, self._mark_unsaved)
+        _write_stats["inserts"] += 1
+        _cache.invalidate(("id", self.id))
+        _invalidate_prefixes()
+        self._persisted = True
+        self._dirty = ()
+
+    def _mark_unsaved(self):
+        # The transaction holding the last save rolled back: write the whole
+        # row again on the next save.
+        object.__setattr__(self, "_persisted", False)
+
+    @staticmethod
+    def write_stats():
+        """
+        Return how many saves inserted a row, updated changed columns, or
+        were skipped because nothing changed.
+        """
+        return dict(_write_stats)
+
+    @staticmethod
+    def configure_cache(maxsize=1024, ttl=None):
+        """
+        Enable (``maxsize > 0``) or disable the LRU read cache used by
+        ``load`` and ``load_by_prefix``; ``ttl`` is in seconds.
+
+        The cache is invalidated by writes made through Task and, via
+        ``PRAGMA data_version``, by commits of other connections. Call
+        ``clear_cache()`` after writing to ``tasks`` with raw SQL.
+        """
+        _cache.maxsize = maxsize
+        _cache.ttl = ttl
+        _cache.clear()
+
+    @staticmethod
+    def clear_cache():
+        """Drop every entry of the read cache."""
+        _cache.clear()
+
+    @staticmethod
+    def cache_stats():
+        """Return size, hit/miss and invalidation counters of the read cache."""
+        return _cache.stats()
+
+    @classmethod
+    def from_row(cls, row, defer_description=False):
+        """
+        Build a Task from a row of ``TASK_COLUMNS`` without touching the
+        database (unlike ``__init__``, which saves a brand new task).
+        Inside ``database.identity_map()`` the known instance is returned.
+        With ``defer_description`` the row's description (typically a NULL
+        placeholder, see ``LIST_FIELDS``) is ignored and fetched on access.
+        """
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            known = identity_map.get(cls, row[0])
+            if known is not None:
+                return known
+        task = cls.__new__(cls)
+        # The row is the stored state: set the slots without dirty tracking.
+        set_field = object.__setattr__
+        task_id, title, description, status, priority, created_at, updated_at = row
+        if defer_description:
+            description = _DEFERRED
+        elif type(description) is bytes:
+            description = decompress(description)
+        set_field(task, "id", task_id)
+        set_field(task, "title", title)
+        set_field(task, "_description", description)
+        set_field(task, "status", status)
+        set_field(task, "priority", priority)
+        set_field(task, "created_at", created_at)
+        set_field(task, "updated_at", updated_at)
+        set_field(task, "_persisted", True)
+        set_field(task, "_dirty", ())
+        if identity_map is not None:
+            identity_map.add(task, task.id)
+        return task
 
     @classmethod
     def load(cls, task_id):
         """Load a task from the database."""
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            known = identity_map.get(cls, task_id)
+            if known is not None:
+                return known
         with get_connection() as conn:
+            if _cache.enabled:
+                _cache.sync(conn)
+                row = _cache.get(("id", task_id))
+                if row is not None:
+                    return cls.from_row(row)
             row = conn.execute(
-                """
-                SELECT id, title, description, status, priority, created_at, updated_at
-                FROM tasks WHERE id = ?
-                """,
+                f"SELECT {TASK_COLUMNS} FROM tasks WHERE id = ?",
                 (task_id,),
             ).fetchone()
             
             if row is None:
                 raise ValueError(f"No task found with ID {task_id}")
-                
-            task = cls(row[1], row[2], row[4])  # title, description, priority
-            task.id = row[0]
-            task.status = row[3]
-            task.created_at = row[5]
-            task.updated_at = row[6]
-            return task
+
+            # Rows read inside an open transaction may still be rolled back,
+            # which does not change data_version, so they are not cached.
+            if not conn.in_transaction:
+                _cache.put(("id", task_id), row)
+            return cls.from_row(row)
+
+    @classmethod
+    def bulk_create(cls, records, in_backlog=False):
+        """
+        Create many tasks in one transaction.
+
+        ``records`` may be any iterable (including a generator) of titles or
+        dicts with ``title`` and optional ``description``, ``priority`` and
+        ``status``. Rows are inserted with ``executemany`` in batches of
+        ``BULK_BATCH_SIZE``; with ``in_backlog=True`` the tasks are also added
+        to the backlog. Returns a list of ``TaskHandle``.
+        """
+        handles = []
+        records = iter(records)
+        with transaction() as conn:
+            while True:
+                rows = [
+                    cls._bulk_row(record, conn.id_strategy)
+                    for record in islice(records, BULK_BATCH_SIZE)
+                ]
+                if not rows:
+                    break
+                threshold = conn.compress_threshold
+                conn.executemany(
+                    f"INSERT INTO tasks ({TASK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows if threshold is None else [
+                        row[:2] + (compress(row[2], threshold),) + row[3:] for row in rows
+                    ],
+                )
+                if in_backlog:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO backlog_tasks (task_id) VALUES (?)",
+                        [(row[0],) for row in rows],
+                    )
+                handles.extend(TaskHandle(row[0], row[1]) for row in rows)
+        _invalidate_prefixes()
+        return handles
+
+    @classmethod
+    def _bulk_row(cls, record, id_strategy):
+        if isinstance(record, str):
+            record = {"title": record}
+        status = record.get("status", "todo")
+        priority = record.get("priority", "medium")
+        if status not in cls.STATUS_OPTIONS:
+            raise ValueError("Invalid status")
+        if priority not in cls.PRIORITY_OPTIONS:
+            raise ValueError("Priority must be one of: low, medium, high")
+        now = datetime.now().isoformat()
+        return (new_id(id_strategy), record["title"], record.get("description", ""),
+                status, priority, now, now)
+
+    @classmethod
+    def bulk_update(cls, ids_or_filter, status=None, priority=None):
+        """
+        Set ``status`` and/or ``priority`` on many tasks with one UPDATE.
+
+        ``ids_or_filter`` is either an iterable of task IDs or a dict filter
+        such as ``{"status": "in_progress", "priority": "high"}`` (``{}``
+        matches every task). ``updated_at`` is refreshed on the updated rows.
+        Returns the number of tasks updated.
+        """
+        assignments = {}
+        if status is not None:
+            if status not in cls.STATUS_OPTIONS:
+                raise ValueError("Invalid status")
+            assignments["status"] = status
+        if priority is not None:
+            if priority not in cls.PRIORITY_OPTIONS:
+                raise ValueError("Priority must be one of: low, medium, high")
+            assignments["priority"] = priority
+        if not assignments:
+            raise ValueError("Nothing to update: pass status and/or priority")
+        assignments["updated_at"] = datetime.now().isoformat()
+        set_clause = ", ".join(f"{column} = ?" for column in assignments)
+        values = list(assignments.values())
+
+        if isinstance(ids_or_filter, dict):
+            conditions = []
+            params = []
+            for column, value in ids_or_filter.items():
+                options = {"status": cls.STATUS_OPTIONS, "priority": cls.PRIORITY_OPTIONS}.get(column)
+                if options is None:
+                    raise ValueError(f"Cannot filter tasks by '{column}'")
+                if value not in options:
+                    raise ValueError(f"Invalid {column} '{value}'")
+                conditions.append(f"{column} = ?")
+                params.append(value)
+            where = " AND ".join(conditions) or "1"
+            with get_connection() as conn:
+                updated = conn.execute(
+                    f"UPDATE tasks SET {set_clause} WHERE {where}", values + params
+                ).rowcount
+            _cache.invalidate_where(lambda key: key[0] == "id")
+            cls._apply_to_known(
+                assignments,
+                lambda task: all(getattr(task, c) == v for c, v in ids_or_filter.items()),
+            )
+            return updated
+
+        task_ids = list(dict.fromkeys(ids_or_filter))
+        updated = 0
+        with transaction() as conn:
+            for start in range(0, len(task_ids), MAX_QUERY_PARAMS):
+                chunk = task_ids[start:start + MAX_QUERY_PARAMS]
+                placeholders = ", ".join("?" * len(chunk))
+                updated += conn.execute(
+                    f"UPDATE tasks SET {set_clause} WHERE id IN ({placeholders})",
+                    values + chunk,
+                ).rowcount
+        id_set = set(task_ids)
+        for task_id in task_ids:
+            _cache.invalidate(("id", task_id))
+        cls._apply_to_known(assignments, lambda task: task.id in id_set)
+        return updated
+
+    @classmethod
+    def _apply_to_known(cls, assignments, matches):
+        """Mirror a set-based UPDATE on the instances of the identity map."""
+        identity_map = current_identity_map()
+        if identity_map is None:
+            return
+        for task in identity_map.instances(cls):
+            if matches(task):
+                for field, value in assignments.items():
+                    object.__setattr__(task, field, value)
+
+    @classmethod
+    def load_many(cls, task_ids):
+        """
+        Load several tasks at once, in the order of ``task_ids``.
+
+        IDs are resolved with chunked ``IN (...)`` queries; unknown IDs are
+        skipped.
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        found = {}
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            for task_id in task_ids:
+                known = identity_map.get(cls, task_id)
+                if known is not None:
+                    found[task_id] = known
+        missing = [task_id for task_id in task_ids if task_id not in found]
+        with get_connection() as conn:
+            for start in range(0, len(missing), MAX_QUERY_PARAMS):
+                chunk = missing[start:start + MAX_QUERY_PARAMS]
+                placeholders = ", ".join("?" * len(chunk))
+                for row in conn.execute(
+                    f"SELECT {TASK_COLUMNS} FROM tasks WHERE id IN ({placeholders})",
+                    chunk,
+                ):
+                    found[row[0]] = cls.from_row(row)
+        return [found[task_id] for task_id in task_ids if task_id in found]
 
     def set_status(self, status):
         if status not in self.STATUS_OPTIONS:
@@ -71,60 +557,185 @@ class Task:
         return self
 
     @staticmethod
-    def search(query):
-        """Search for tasks by title or description."""
-        results = []
+    def search(query, fuzzy=False, limit=None):
+        """
+        Search for tasks by title or description, at most ``limit`` of them.
+
+        With the full-text index the words of ``query`` are matched as a
+        phrase (the last word as a prefix) and the best matches come first;
+        databases without FTS5 fall back to a substring scan. ``fuzzy=True``
+        tolerates typos, see ``fuzzy_search``.
+        """
+        if fuzzy:
+            return [hit.task for hit in Task.fuzzy_search(query, limit=limit or 10)]
         with get_connection() as conn:
+            if re.search(r"\w", query) and has_table(conn, "tasks_fts"):
+                hits = Task.search_ranked(query, phrase=True, limit=limit)
+                return [hit.task for hit in hits]
             cursor = conn.execute(
-                """
-                SELECT id, title, description, status, priority
-                FROM tasks
-                WHERE title LIKE ? OR description LIKE ?
+                f"""
+                SELECT {task_columns("t", LIST_FIELDS)}
+                FROM tasks t
+                WHERE title LIKE ? OR {SQL_FUNCTION}(description) LIKE ?
+                LIMIT ?
                 """,
-                (f"%{query}%", f"%{query}%"),
+                (f"%{query}%", f"%{query}%", -1 if limit is None else limit),
             )
-            for row in cursor.fetchall():
-                # Create task instance without saving
-                task = Task.__new__(Task)
-                task.id = row[0]
-                task.title = row[1]
-                task.description = row[2]
-                task.status = row[3]
-                task.priority = row[4]
-                results.append(task)
-        return results
+            return [Task.from_row(row, defer_description=True) for row in cursor]
 
     @staticmethod
-    def list_all(status=None, priority=None):
-        """List all tasks, optionally filtered by status and/or priority."""
+    def search_ranked(query, status=None, priority=None, limit=20, phrase=False, prefix=True):
+        """
+        Ranked full-text search over title and description.
+
+        Every word of ``query`` must match (as a word prefix when ``prefix``),
+        or with ``phrase=True`` the words must appear in order. Results can
+        be narrowed by ``status``/``priority`` and are ordered by bm25 with
+        title matches weighted higher. Returns ``SearchHit`` tuples whose
+        snippet marks matches with [brackets]. Without FTS5 every word is
+        matched as a substring, unranked (score and snippet are None).
+        """
+        words = re.findall(r"\w+", query)
+        if not words:
+            return []
+        conditions = []
+        params = []
+        if status:
+            conditions.append("t.status = ?")
+            params.append(status)
+        if priority:
+            conditions.append("t.priority = ?")
+            params.append(priority)
+
         with get_connection() as conn:
-            query = """SELECT id, title, description, status, priority, created_at 
-                      FROM tasks"""
-            conditions = []
-            params = []
-            
-            if status:
-                conditions.append("status = ?")
-                params.append(status)
-            if priority:
-                conditions.append("priority = ?")
-                params.append(priority)
-                
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-                
-            cursor = conn.execute(query, params)
-            tasks = []
-            for row in cursor.fetchall():
-                task = Task.__new__(Task)
-                task.id = row[0]
-                task.title = row[1]
-                task.description = row[2]
-                task.status = row[3]
-                task.priority = row[4]
-                task.created_at = row[5]
-                tasks.append(task)
-            return tasks
+            if has_table(conn, "tasks_fts"):
+                match = fts_match(words, phrase, prefix)
+                where = "".join(f" AND {condition}" for condition in conditions)
+                cursor = conn.execute(
+                    f"""
+                    SELECT {task_columns("t", LIST_FIELDS)},
+                           bm25(tasks_fts, 10.0, 1.0) AS score,
+                           snippet(tasks_fts, -1, '[', ']', '...', 12)
+                    FROM tasks_fts
+                    JOIN tasks t ON t.rowid = tasks_fts.rowid
+                    WHERE tasks_fts MATCH ?{where}
+                    ORDER BY score
+                    LIMIT ?
+                    """,
+                    [match] + params + [-1 if limit is None else limit],
+                )
+                return [
+                    SearchHit(Task.from_row(row[:7], defer_description=True), row[7], row[8])
+                    for row in cursor
+                ]
+
+            for word in [" ".join(words)] if phrase else words:
+                conditions.append(f"(t.title LIKE ? OR {SQL_FUNCTION}(t.description) LIKE ?)")
+                params += [f"%{word}%", f"%{word}%"]
+            cursor = conn.execute(
+                f"""
+                SELECT {task_columns("t", LIST_FIELDS)} FROM tasks t
+                WHERE {" AND ".join(conditions)}
+                LIMIT ?
+                """,
+                params + [-1 if limit is None else limit],
+            )
+            return [
+                SearchHit(Task.from_row(row, defer_description=True), None, None)
+                for row in cursor
+            ]
+
+    @staticmethod
+    def fuzzy_search(query, limit=10, threshold=0.3):
+        """
+        Typo-tolerant title search returning the ``limit`` most similar
+        tasks as ``FuzzyHit`` tuples, best first.
+
+        Similarity is the share of the query's trigrams found in the title;
+        titles below ``threshold`` are dropped. The trigram index supplies
+        candidates, so only a few hundred titles are scored per lookup.
+        """
+        grams = fuzzy.trigrams(query)
+        if not grams:
+            return []
+        indexed = sorted(gram for gram in grams if " " not in gram)
+        with get_connection() as conn:
+            if indexed and has_table(conn, "tasks_trigram"):
+                # Candidates are the titles sharing the most trigrams with the
+                # query; counting in SQL is much cheaper than bm25 ordering.
+                postings = " UNION ALL ".join(
+                    ["SELECT rowid FROM tasks_trigram WHERE tasks_trigram MATCH ?"] * len(indexed)
+                )
+                rows = conn.execute(
+                    f"""
+                    SELECT t.id, t.title
+                    FROM (
+                        SELECT rowid, COUNT(*) AS shared FROM ({postings})
+                        GROUP BY rowid ORDER BY shared DESC LIMIT ?
+                    ) AS candidates
+                    JOIN tasks t ON t.rowid = candidates.rowid
+                    """,
+                    [f'"{gram}"' for gram in indexed]
+                    + [max(limit * FUZZY_CANDIDATES_PER_HIT, 200)],
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT id, title FROM tasks").fetchall()
+        ranked = fuzzy.rank(query, rows, key=lambda row: row[1], limit=limit, threshold=threshold)
+        tasks = {task.id: task for task in Task.load_many(row[0] for row, _ in ranked)}
+        return [FuzzyHit(tasks[row[0]], score) for row, score in ranked if row[0] in tasks]
+
+    @staticmethod
+    def query():
+        """Start a composable ``TaskQuery`` (see ``pyscrum.query``)."""
+        from .query import TaskQuery
+        return TaskQuery()
+
+    @staticmethod
+    def list_all(status=None, priority=None, after=None, limit=None, fields=None):
+        """
+        List all tasks, optionally filtered by status and/or priority.
+        Paginated and projected like ``iter_all``.
+        """
+        return list(Task.iter_all(status, priority, after=after, limit=limit, fields=fields))
+
+    @classmethod
+    def iter_all(cls, status=None, priority=None, after=None, limit=None,
+                 batch_size=PAGE_SIZE, fields=None):
+        """
+        Yield tasks ordered by creation time (then ID), optionally filtered
+        by status and/or priority.
+
+        Rows are fetched ``batch_size`` at a time with keyset pagination, so
+        memory use does not grow with the table and no connection is held
+        between batches. ``after`` is the ID of the last task of the previous
+        page; ``limit`` caps the number of tasks yielded. With ``fields``
+        only those columns are fetched and ``TaskRow``s are yielded.
+        """
+        if fields is not None:
+            fields = ("id", "created_at") + tuple(fields)  # the pagination key
+        query = cls.query().filter(status=status or None, priority=priority or None)
+        position = None
+        if after is not None:
+            with get_connection() as conn:
+                position = conn.execute(
+                    "SELECT created_at, id FROM tasks WHERE id = ?", (after,)
+                ).fetchone()
+            if position is None:
+                raise ValueError(f"Unknown cursor '{after}'")
+
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            page = query.order_by("created_at", "id").limit(size).defer_description()
+            if position is not None:
+                page = page.where("(t.created_at, t.id) > (?, ?)", *position)
+            tasks = page.all() if fields is None else page.rows(*fields)
+            yield from tasks
+            if len(tasks) < size:
+                return
+            position = (tasks[-1].created_at, tasks[-1].id)
+            if remaining is not None:
+                remaining -= len(tasks)
 
     @staticmethod
     def load_by_prefix(prefix):
@@ -133,10 +744,14 @@ class Task:
             raise ValueError("Prefix must be at least 3 characters long")
         
         with get_connection() as conn:
+            if _cache.enabled:
+                _cache.sync(conn)
+                task_id = _cache.get(("prefix", prefix))
+                if task_id is not None:
+                    return Task.load(task_id)
             cursor = conn.execute(
-                """SELECT id, title, description, status, priority, created_at 
-                   FROM tasks WHERE id LIKE ?""",
-                (f"{prefix}%",),
+                f"SELECT {TASK_COLUMNS} FROM tasks WHERE id >= ? AND id < ? LIMIT 2",
+                id_prefix_range(prefix),
             )
             rows = cursor.fetchall()
             if not rows:
@@ -144,32 +759,136 @@ class Task:
             if len(rows) > 1:
                 raise ValueError(f"Multiple tasks found with prefix '{prefix}'")
             
-            row = rows[0]
-            task = Task.__new__(Task)
-            task.id = row[0]
-            task.title = row[1]
-            task.description = row[2]
-            task.status = row[3]
-            task.priority = row[4]
-            task.created_at = row[5]
-            return task
+            if not conn.in_transaction:  # see Task.load
+                _cache.put(("prefix", prefix), rows[0][0])
+                _cache.put(("id", rows[0][0]), rows[0])
+            return Task.from_row(rows[0])
+
+    @staticmethod
+    def short_ids(min_length=3):
+        """
+        Map every task ID to its shortest unique prefix (at least
+        ``min_length`` characters, what ``load_by_prefix`` accepts), like
+        git's abbreviated hashes.
+
+        Walks the IDs in primary-key order: an ID needs one character more
+        than it shares with either neighbour. Time-ordered IDs share their
+        leading timestamp, so theirs are longer (up to 13 characters for
+        ULIDs created in the same millisecond).
+        """
+        with get_connection() as conn:
+            ids = [row[0] for row in conn.execute("SELECT id FROM tasks ORDER BY id")]
+
+        def shared(a, b):
+            length = 0
+            for x, y in zip(a, b):
+                if x != y:
+                    break
+                length += 1
+            return length
+
+        shortest = {}
+        previous = 0
+        for index, task_id in enumerate(ids):
+            following = shared(task_id, ids[index + 1]) if index + 1 < len(ids) else 0
+            shortest[task_id] = task_id[:max(min_length, previous + 1, following + 1)]
+            previous = following
+        return shortest
 
     @classmethod
     def load_all(cls):
-        """Load all tasks from the database."""
+        """Load all tasks from the database (use ``iter_all`` to stream)."""
+        return list(cls.iter_all())
+
+    @classmethod
+    def purge_phantoms(cls, dry_run=True):
+        """
+        Find (with ``dry_run=False`` delete) the duplicate rows older
+        versions of ``Task.load`` inserted.
+
+        A phantom is a 'todo' task that no backlog, sprint or comment refers
+        to, that has an older twin with the same title, description and
+        priority, and that was never saved again after its insert
+        (``updated_at`` within ``PHANTOM_SAVE_GAP`` after ``created_at``;
+        ``bulk_create`` rows have equal timestamps and never match). A task
+        created twice with ``Task()`` looks the same, so review the list
+        before deleting. Returns the IDs of the phantoms.
+        """
         with get_connection() as conn:
-            cursor = conn.execute("SELECT id, title, description, status, priority FROM tasks")
-            tasks = []
-            for row in cursor:
-                # Create task instance without saving
-                task = cls.__new__(cls)
-                task.id = row[0]
-                task.title = row[1]
-                task.description = row[2]
-                task.status = row[3]
-                task.priority = row[4]
-                tasks.append(task)
-            return tasks
+            ids = [
+                row[0]
+                for row in conn.execute(
+                    """
+                    SELECT p.id FROM (
+                        -- One sorted pass: the oldest creation time among
+                        -- the rows with the same title, description, priority.
+                        SELECT id, status, created_at, updated_at,
+                               MIN(created_at) OVER (
+                                   PARTITION BY title, description, priority
+                               ) AS first_created
+                        FROM tasks
+                    ) p
+                    WHERE p.status = 'todo'
+                      AND p.created_at > p.first_created
+                      AND p.updated_at > p.created_at
+                      AND (julianday(p.updated_at) - julianday(p.created_at)) * 86400 < ?
+                      AND NOT EXISTS (SELECT 1 FROM backlog_tasks b WHERE b.task_id = p.id)
+                      AND NOT EXISTS (SELECT 1 FROM sprint_tasks s WHERE s.task_id = p.id)
+                      AND NOT EXISTS (SELECT 1 FROM task_comments c WHERE c.task_id = p.id)
+                    ORDER BY p.created_at, p.id
+                    """,
+                    (PHANTOM_SAVE_GAP,),
+                )
+            ]
+            if not dry_run:
+                conn.executemany("DELETE FROM tasks WHERE id = ?", [(i,) for i in ids])
+                _cache.clear()
+                identity_map = current_identity_map()
+                if identity_map is not None:
+                    for task_id in ids:
+                        identity_map.discard(cls, task_id)
+            return ids
+
+    @classmethod
+    def rekey(cls, vacuum=True):
+        """
+        Give every task a new ID of the database's time-ordered ID strategy
+        (see ``database.set_id_strategy``), derived from its ``created_at``,
+        and rewrite the sprint, backlog and comment references with it.
+
+        Afterwards the primary-key index is in creation order; ``vacuum``
+        also rebuilds the file so the pages are too. Task objects loaded
+        before keep their old ID. Returns the number of tasks re-keyed.
+        """
+        with transaction() as conn:
+            strategy = conn.id_strategy
+            if strategy == "uuid4":
+                raise ValueError("Re-keying needs a time-ordered ID strategy (uuid7 or ulid)")
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS task_id_map (old TEXT PRIMARY KEY, new TEXT NOT NULL)"
+            )
+            rows = conn.execute("SELECT id, created_at FROM tasks ORDER BY created_at, id").fetchall()
+            conn.executemany(
+                "INSERT INTO temp.task_id_map (old, new) VALUES (?, ?)",
+                [(task_id, new_id(strategy, _millis(created_at))) for task_id, created_at in rows],
+            )
+            for table, column in (("tasks", "id"), ("sprint_tasks", "task_id"),
+                                  ("backlog_tasks", "task_id"), ("task_comments", "task_id")):
+                conn.execute(
+                    f"""
+                    UPDATE {table}
+                    SET {column} = (SELECT new FROM temp.task_id_map WHERE old = {table}.{column})
+                    WHERE {column} IN (SELECT old FROM temp.task_id_map)
+                    """
+                )
+            conn.execute("DROP TABLE temp.task_id_map")
+        _cache.clear()
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            identity_map.clear(cls)
+        if vacuum:
+            vacuum_database()
+        return len(rows)
 
     @classmethod
     def clear_all(cls):
@@ -179,6 +898,10 @@ class Task:
                 conn.execute("DELETE FROM tasks")
         except sqlite3.OperationalError:
             pass
+        _cache.clear()
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            identity_map.clear(cls)
 
     def set_priority(self, priority):
         """Set the priority of the task."""
@@ -1,13 +1,15 @@
 import os
 import pytest
-from pyscrum.database import init_db
+from pyscrum.database import init_db, close_all
 
 @pytest.fixture(autouse=True)
 def setup_test_db():
     """Setup a fresh test database for each test."""
+    close_all()
     if os.path.exists("pyscrum.db"):
         os.remove("pyscrum.db")
     init_db()
     yield
+    close_all()
     if os.path.exists("pyscrum.db"):
         os.remove("pyscrum.db")
\ No newline at end of file
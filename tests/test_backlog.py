@@ -2,17 +2,19 @@ import pytest
 import os
 from pyscrum.backlog import Backlog
 from pyscrum.task import Task
-from pyscrum.database import init_db
+from pyscrum.database import init_db, close_all
 import sqlite3
 from pyscrum.database import get_connection
 
 @pytest.fixture(autouse=True)
 def setup_database():
     """Setup a fresh database for each test."""
+    close_all()
     if os.path.exists("pyscrum.db"):
         os.remove("pyscrum.db")
     init_db()
     yield
+    close_all()
     if os.path.exists("pyscrum.db"):
         os.remove("pyscrum.db")
 
@@ -192,3 +194,55 @@ def test_load_backlog():
     loaded = Backlog.load()
     ids = [t.id for t in loaded.tasks]
     assert task.id in ids
+
+def test_backlog_is_loaded_lazily():
+    task = Task("Lazy backlog")
+    Backlog().add_task(task)
+
+    backlog = Backlog()
+    assert not backlog._members.loaded
+    assert backlog.has_task(task.id)
+    assert backlog.get_task(task.id).title == "Lazy backlog"
+    with pytest.raises(ValueError):
+        backlog.get_task("ghost-id")
+    backlog.remove_task(task.id)
+    assert not backlog._members.loaded
+    assert backlog.tasks == []
+
+def test_backlog_add_tasks():
+    backlog = Backlog()
+    assert backlog.tasks == []
+    handles = backlog.add_tasks(["First", {"title": "Second", "description": "d"}])
+    assert [h.title for h in handles] == ["First", "Second"]
+    assert [t.title for t in backlog.tasks] == ["First", "Second"]
+    assert len(Backlog().tasks) == 2
+
+def test_backlog_add_tasks_keeps_loaded_instances():
+    backlog = Backlog()
+    assert backlog.tasks == []
+    mine = Task("Mine")
+    backlog.add_task(mine)
+    mine.title = "Mine, unsaved"
+    backlog.add_tasks(["Bulk"])
+    assert backlog.tasks[0] is mine
+    assert [t.title for t in backlog.tasks] == ["Mine, unsaved", "Bulk"]
+
+def test_backlog_iter_tasks_pages_in_backlog_order():
+    backlog = Backlog()
+    handles = backlog.add_tasks([f"Item {i}" for i in range(5)])
+    streamed = backlog.iter_tasks(batch_size=2)
+    assert [t.id for t in streamed] == [h.id for h in handles]
+    page = list(backlog.iter_tasks(after=handles[1].id, limit=2))
+    assert [t.title for t in page] == ["Item 2", "Item 3"]
+    assert not backlog._members.loaded
+
+def test_backlog_filters_query_without_loading():
+    backlog = Backlog()
+    urgent = Task("Urgent", priority="high")
+    backlog.add_task(urgent)
+    backlog.add_task(Task("Later", priority="low"))
+    urgent.set_status("done")
+
+    assert backlog.list_by_priority("high") == [urgent]
+    assert [t.title for t in backlog.list_by_status("todo")] == ["Later"]
+    assert not backlog._members.loaded
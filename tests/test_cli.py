@@ -2,7 +2,7 @@ import os
 import pytest
 from typer.testing import CliRunner
 from pyscrum.cli import app
-from pyscrum.database import init_db
+from pyscrum.database import init_db, close_all
 from pyscrum.task import Task
 from pyscrum.sprint import Sprint
 
@@ -11,6 +11,7 @@ runner = CliRunner()
 
 @pytest.fixture(autouse=True)
 def clean_db():
+    close_all()
     if os.path.exists("pyscrum.db"):
         os.remove("pyscrum.db")
 
@@ -122,6 +123,14 @@ def test_list_tasks():
     assert "Test List Tasks" in result.output
 
 
+def test_list_tasks_short_ids():
+    runner.invoke(app, ["add-task", "Short ID Task"])
+    task_id = Task.search("Short ID Task")[0].id
+    result = runner.invoke(app, ["list-tasks", "--short-ids"])
+    assert f" - {task_id[:3]}: Short ID Task (todo) [medium]" in result.output
+    assert task_id not in result.output
+
+
 def test_get_task_not_found():
     result = runner.invoke(app, ["get-task", "nonexistent"])
     assert "no task found" in result.output.lower()
@@ -498,3 +507,90 @@ def verify_task_in_sprint(task_title: str, sprint_name: str) -> bool:
 def verify_task_status(task_id: str, expected_status: str) -> bool:
     result = runner.invoke(app, ["get-task", task_id])
     return expected_status.lower() in result.output.lower()
+
+
+def test_db_profile_option():
+    from pyscrum.database import set_profile
+    try:
+        result = runner.invoke(app, ["--profile", "balanced", "db-profile"])
+        assert "profile: balanced" in result.output
+        assert "journal_mode: wal" in result.output
+
+        result = runner.invoke(app, ["--profile", "turbo", "db-profile"])
+        assert "Unknown database profile" in result.output
+    finally:
+        set_profile(None)
+
+
+def test_purge_phantoms():
+    runner.invoke(app, ["add-task", "Twin"])
+    Task("Twin")  # What the old Task.load inserted
+    Task.bulk_create(["Real twin", "Real twin"])
+    result = runner.invoke(app, ["purge-phantoms"])
+    assert "1 phantom task(s) found" in result.output and "Twin" in result.output
+    assert "Real twin" not in result.output
+    assert len(Task.load_all()) == 4
+    result = runner.invoke(app, ["purge-phantoms", "--apply"])
+    assert "Twin" in result.output
+    assert "Removed 1 phantom task(s)" in result.output
+
+
+def test_set_status_and_priority_for_many_tasks():
+    ids = [h.id for h in Task.bulk_create(["Many A", "Many B", "Many C"])]
+    result = runner.invoke(app, ["set-status", ids[0][:8], ids[1][:8], "done"])
+    assert "2 task(s) status updated to done" in result.output
+
+    result = runner.invoke(app, ["set-priority", "--where-status", "done", "--priority", "high"])
+    assert "2 task(s) priority set to high" in result.output
+    assert {t.id for t in Task.list_all(priority="high")} == set(ids[:2])
+
+    result = runner.invoke(app, ["set-status", "done"])
+    assert "Provide task IDs" in result.output
+
+
+def test_search_sprint_tasks_fuzzy():
+    sprint = Sprint("Fuzzy Sprint")
+    sprint.add_task(Task("Deploy to staging"))
+    result = runner.invoke(app, ["search-sprint-tasks", "Fuzzy Sprint", "stagng"])
+    assert "No matching tasks found." in result.output
+    result = runner.invoke(app, ["search-sprint-tasks", "Fuzzy Sprint", "stagng", "--fuzzy"])
+    assert "Deploy to staging" in result.output
+
+
+def test_list_commands_paginate():
+    from pyscrum.backlog import Backlog
+
+    handles = Backlog().add_tasks([f"Paged {i}" for i in range(3)])
+    result = runner.invoke(app, ["list-tasks", "--limit", "2"])
+    assert "Paged 0" in result.output and "Paged 1" in result.output
+    assert "Paged 2" not in result.output
+    assert f"--cursor {handles[1].id}" in result.output
+
+    result = runner.invoke(app, ["list-backlog", "--limit", "2", "--cursor", handles[1].id])
+    assert "Paged 2" in result.output and "--cursor" not in result.output
+
+    result = runner.invoke(app, ["list-tasks-by-status", "todo", "--limit", "1", "--cursor", "nope"])
+    assert "Unknown cursor" in result.output
+
+
+def test_compress_storage_command():
+    runner.invoke(app, ["add-task", "Big", "--description", "lorem ipsum " * 200])
+    result = runner.invoke(app, ["compress-storage", "--threshold", "512"])
+    assert "📦 tasks.description:" in result.output
+    assert "stored compressed" in result.output
+    result = runner.invoke(app, ["list-tasks-by-status", "todo"])
+    assert "Big" in result.output
+
+    result = runner.invoke(app, ["compress-storage", "--disable", "--no-vacuum"])
+    assert "stored uncompressed" in result.output
+
+
+def test_id_strategy_command():
+    runner.invoke(app, ["add-task", "Keyed"])
+    result = runner.invoke(app, ["id-strategy"])
+    assert "New task IDs: uuid4" in result.output
+    result = runner.invoke(app, ["id-strategy", "ulid", "--rekey", "--no-vacuum"])
+    assert "Re-keyed 1 tasks" in result.output and "New task IDs: ulid" in result.output
+    assert len(Task.load_all()[0].id) == 26
+    result = runner.invoke(app, ["id-strategy", "serial"])
+    assert "Unknown ID strategy" in result.output
@@ -0,0 +1,312 @@
+import os
+import pytest
+from pyscrum import database
+from pyscrum.database import get_connection, close_all, configure_pool, pool_stats
+from pyscrum.task import Task
+
+
+def test_connections_are_reused():
+    close_all()
+    before = pool_stats()
+    for _ in range(10):
+        with get_connection() as conn:
+            conn.execute("SELECT 1")
+    after = pool_stats()
+    assert after["opened"] - before["opened"] <= 1
+    assert after["reused"] - before["reused"] >= 9
+
+
+def test_nested_calls_share_connection():
+    with get_connection() as outer:
+        with get_connection() as inner:
+            assert inner is outer
+
+
+def test_close_all_empties_pool():
+    with get_connection() as conn:
+        conn.execute("SELECT 1")
+    close_all()
+    assert database._pool._idle == {}
+
+
+def test_pool_is_reset_after_fork():
+    with get_connection() as conn:
+        conn.execute("SELECT 1")
+    database._pool._pid = -1  # pretend we are a forked child
+    with get_connection() as conn:
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+    assert database._pool._pid != -1
+
+
+def test_pool_follows_working_directory(tmp_path, monkeypatch):
+    first, second = tmp_path / "d1", tmp_path / "d2"
+    first.mkdir()
+    second.mkdir()
+    monkeypatch.chdir(first)
+    database.init_db()
+    Task("In d1")
+    monkeypatch.chdir(second)
+    database.init_db()
+    Task("In d2")
+    assert [t.title for t in Task.load_all()] == ["In d2"]
+    assert (second / "pyscrum.db").exists()
+    monkeypatch.chdir(first)
+    assert [t.title for t in Task.load_all()] == ["In d1"]
+
+
+def test_configure_pool_size():
+    configure_pool(0)
+    try:
+        Task("Unpooled")
+        assert database._pool._idle.get(os.path.abspath(database.DB_NAME), []) == []
+        with pytest.raises(ValueError):
+            configure_pool(-1)
+    finally:
+        configure_pool()
+
+
+def _count_tasks():
+    import sqlite3
+    conn = sqlite3.connect(database.DB_NAME)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_transaction_defers_commit():
+    with database.transaction():
+        for i in range(5):
+            Task(f"Batch {i}")
+        assert _count_tasks() == 0
+    assert _count_tasks() == 5
+
+
+def test_transaction_rolls_back_on_error():
+    with pytest.raises(RuntimeError):
+        with database.transaction():
+            Task("Doomed")
+            raise RuntimeError("boom")
+    assert _count_tasks() == 0
+
+
+def test_nested_transaction_uses_savepoint():
+    with database.transaction():
+        Task("Kept")
+        with pytest.raises(RuntimeError):
+            with database.transaction():
+                Task("Discarded")
+                raise RuntimeError("boom")
+    assert [t.title for t in Task.load_all()] == ["Kept"]
+
+
+@pytest.fixture
+def restore_profile():
+    yield
+    database.set_profile(None)
+
+
+def test_default_profile_is_durable(restore_profile, monkeypatch):
+    monkeypatch.delenv(database.PROFILE_ENV_VAR, raising=False)
+    settings = database.profile_settings()
+    assert settings["profile"] == "durable"
+    assert settings["journal_mode"] == "delete"
+
+
+def test_set_profile_applies_pragmas(restore_profile):
+    database.set_profile("balanced")
+    settings = database.profile_settings()
+    assert settings["profile"] == "balanced"
+    assert settings["journal_mode"] == "wal"
+    assert settings["synchronous"] == 1  # NORMAL
+    assert settings["temp_store"] == 2  # MEMORY
+
+
+def test_profile_from_env(restore_profile, monkeypatch):
+    monkeypatch.setenv(database.PROFILE_ENV_VAR, "fast-ephemeral")
+    database.close_all()
+    assert database.active_profile() == "fast-ephemeral"
+    assert database.profile_settings()["synchronous"] == 0
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        database.set_profile("turbo")
+
+
+def test_init_db_sets_schema_version():
+    with get_connection() as conn:
+        assert database.get_schema_version(conn) == database.SCHEMA_VERSION
+    assert database.migrate() == []
+
+
+def test_migrate_upgrades_legacy_database():
+    with get_connection() as conn:
+        for index in ("idx_tasks_status", "idx_tasks_priority", "idx_tasks_created_at_id",
+                      "idx_sprint_tasks_task_id", "idx_task_comments_task_id"):
+            conn.execute(f"DROP INDEX {index}")
+        conn.execute("PRAGMA user_version = 0")
+    Task("Survives migration")
+    assert "tasks by status" in database.check_query_plans()
+
+    applied = database.migrate()
+    assert "add lookup indexes" in applied
+    assert [t.title for t in Task.load_all()] == ["Survives migration"]
+
+
+def test_migrate_keys_sprints_by_id():
+    with get_connection() as conn:
+        conn.execute("DROP TABLE sprint_tasks")
+        conn.execute("DROP TABLE sprints")
+        conn.execute("CREATE TABLE sprints (name TEXT PRIMARY KEY, status TEXT, created_at TIMESTAMP)")
+        conn.execute(
+            "CREATE TABLE sprint_tasks (sprint_name TEXT, task_id TEXT, "
+            "PRIMARY KEY (sprint_name, task_id))"
+        )
+        conn.execute("INSERT INTO sprints (name, status) VALUES ('Legacy', 'Planned'), ('Other', 'Completed')")
+        conn.execute("PRAGMA user_version = 6")
+    first, second = Task("First"), Task("Second")
+    with get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO sprint_tasks (sprint_name, task_id) VALUES ('Legacy', ?)",
+            [(second.id,), (first.id,)],
+        )
+
+    assert database.migrate() == ["add sprint ids"]
+    from pyscrum.sprint import Sprint
+    sprints = Sprint.list_all()
+    assert [(s.id, s.name) for s in sprints] == [(1, "Legacy"), (2, "Other")]
+    assert [t.title for t in sprints[0].tasks] == ["Second", "First"]
+    assert database.check_query_plans() == {}
+
+
+def test_migrate_sprints_created_by_old_sprint_save():
+    # Sprint.save() used to create the sprints table without created_at.
+    with get_connection() as conn:
+        conn.execute("DROP TABLE sprint_tasks")
+        conn.execute("DROP TABLE sprints")
+        conn.execute(
+            "CREATE TABLE sprints (name TEXT PRIMARY KEY, status TEXT DEFAULT 'Planned')"
+        )
+        conn.execute(
+            "CREATE TABLE sprint_tasks (sprint_name TEXT, task_id TEXT, "
+            "PRIMARY KEY (sprint_name, task_id))"
+        )
+        conn.execute("INSERT INTO sprints (name, status) VALUES ('Old Save', 'Planned')")
+        conn.execute("PRAGMA user_version = 0")
+
+    assert "add sprint ids" in database.migrate()
+    from pyscrum.sprint import Sprint
+    assert [s.name for s in Sprint.list_all()] == ["Old Save"]
+    with get_connection() as conn:
+        assert conn.execute("SELECT created_at FROM sprints").fetchone()[0] is not None
+
+
+def test_hot_queries_use_indexes():
+    assert database.check_query_plans() == {}
+
+
+def test_schema_is_ensured_once_per_database(tmp_path, monkeypatch):
+    calls = []
+    original = database.ensure_schema
+    monkeypatch.setattr(database, "ensure_schema", lambda conn: calls.append(conn) or original(conn))
+    monkeypatch.setattr(database, "DB_NAME", str(tmp_path / "fresh.db"))
+    configure_pool(0)  # force a new connection for every call
+    try:
+        for _ in range(3):
+            Task("No DDL")
+        assert len(calls) == 1
+        assert len(Task.load_all()) == 3
+    finally:
+        configure_pool()
+        close_all()
+
+
+def test_identity_map_shares_instances():
+    from pyscrum.backlog import Backlog
+    from pyscrum.sprint import Sprint
+
+    task = Task("Shared")
+    Backlog().add_task(task)
+    Sprint("Shared Sprint").add_task(task)
+
+    with database.identity_map() as identity_map:
+        in_backlog = Backlog().tasks[0]
+        in_sprint = Sprint.from_name("Shared Sprint").tasks[0]
+        assert in_backlog is in_sprint
+        assert Task.load(task.id) is in_backlog
+        assert Task.load_many([task.id]) == [in_backlog]
+        assert identity_map.hits >= 2
+
+        in_sprint.set_status("done")
+        assert in_backlog.status == "done"
+        Task.bulk_update([task.id], priority="high")
+        assert in_backlog.priority == "high"
+
+    assert Task.load(task.id) is not in_backlog
+
+
+def _storage_types(column="description", table="tasks"):
+    with get_connection() as conn:
+        return {row[0] for row in conn.execute(f"SELECT typeof({column}) FROM {table}")}
+
+
+def test_compress_storage_round_trip():
+    long_text = "the parser drops unicode input " * 40
+    task = Task("Parser bug", long_text)
+    Task("Short", "tiny")
+    with get_connection() as conn:
+        conn.execute(
+            "INSERT INTO task_comments (id, task_id, content) VALUES ('c1', ?, ?)",
+            (task.id, "comment text " * 100),
+        )
+
+    report = database.compress_storage(threshold=100)
+    assert report["tasks.description"][1] < report["tasks.description"][0]
+    assert report["task_comments.content"][1] < report["task_comments.content"][0]
+    assert _storage_types() == {"blob", "text"}
+    assert _storage_types("content", "task_comments") == {"blob"}
+
+    assert Task.load(task.id).description == long_text
+    assert Task.list_all()[0].description == long_text
+    hit, = Task.search_ranked("unicode")
+    assert hit.task.id == task.id and "[unicode]" in hit.snippet
+
+    new = Task("Also long", "compressible words " * 20)
+    new.description += " appended"
+    new.save()
+    assert [t.id for t in Task.search("appended")] == [new.id]
+    assert Task.load(new.id).description.endswith(" appended")
+
+    database.compress_storage(threshold=None)
+    assert _storage_types() == {"text"}
+    assert [t.id for t in Task.search("unicode")] == [task.id]
+
+
+def test_rekey_rewrites_references():
+    from pyscrum.backlog import Backlog
+    from pyscrum.sprint import Sprint
+
+    with pytest.raises(ValueError):
+        Task.rekey()
+    old = Task("Old")
+    old.created_at = "2024-01-01T00:00:00"
+    old.save()
+    new = Task("New")
+    Backlog().add_task(old)
+    Sprint("Rekey Sprint").add_task(new)
+    with get_connection() as conn:
+        conn.execute(
+            "INSERT INTO task_comments (id, task_id, content) VALUES ('c1', ?, 'note')",
+            (old.id,),
+        )
+
+    database.set_id_strategy("uuid7")
+    assert Task.rekey() == 2
+    with get_connection() as conn:
+        ids = [row[0] for row in conn.execute("SELECT id FROM tasks ORDER BY id")]
+        assert conn.execute("SELECT task_id FROM task_comments").fetchone()[0] == ids[0]
+    assert old.id not in ids and all(task_id[14] == "7" for task_id in ids)
+    assert [t.title for t in Backlog().list_by_status("todo")] == ["Old"]
+    assert [t.title for t in Sprint.from_name("Rekey Sprint").tasks] == ["New"]
+    assert [t.title for t in Task.search("old")] == ["Old"]
@@ -0,0 +1,66 @@
+import pytest
+from pyscrum.backlog import Backlog
+from pyscrum.database import get_connection
+from pyscrum.sprint import Sprint
+from pyscrum.task import Task
+
+
+def _titles(query):
+    return [task.title for task in query]
+
+
+def test_query_filters_combine():
+    Task("Login bug", priority="high")
+    Task("Login docs", priority="low").set_status("done")
+    Task("Billing", priority="high")
+
+    assert _titles(Task.query().filter(priority="high")) == ["Login bug", "Billing"]
+    assert _titles(Task.query().filter(priority=["high", "low"], status="todo")) == ["Login bug", "Billing"]
+    assert _titles(Task.query().filter(text="login", status="done")) == ["Login docs"]
+    assert Task.query().filter(text="login").count() == 2
+    assert Task.query().filter(text="!!").exists() is False
+
+
+def test_query_sprint_backlog_and_dates():
+    sprint = Sprint("Query Sprint")
+    old = Task("Old")
+    old.created_at = "2024-01-01T00:00:00"
+    old.save()
+    new = Task("New")
+    sprint.add_task(new)
+    sprint.add_task(old)
+    Backlog().add_task(old)
+
+    assert _titles(Task.query().filter(sprint="Query Sprint")) == ["New", "Old"]
+    assert _titles(Task.query().filter(in_backlog=True)) == ["Old"]
+    assert _titles(Task.query().filter(in_backlog=False)) == ["New"]
+    assert _titles(Task.query().filter(created_before="2025-01-01")) == ["Old"]
+    assert _titles(Task.query().filter(created_after="2025-01-01")) == ["New"]
+
+
+def test_query_order_limit_and_reuse():
+    for priority in ("low", "high", "medium"):
+        Task(f"Task {priority}", priority=priority)
+    base = Task.query().order_by("priority")
+    assert _titles(base) == ["Task high", "Task low", "Task medium"]
+    assert _titles(base.limit(2)) == ["Task high", "Task low"]
+    assert base.limit(2).count() == 2
+    assert Task.query().order_by("-title").first().title == "Task medium"
+    assert base.count() == 3
+    with pytest.raises(ValueError):
+        Task.query().order_by("title; DROP TABLE tasks")
+
+
+def test_query_compiles_to_one_statement():
+    sql, params = Task.query().filter(status="todo", sprint="S", text="api").limit(5).compile()
+    assert sql.count("SELECT") == 2  # the full-text lookup is a subquery
+    assert params == ["S", "todo", '"api"*', 5]
+
+    statements = []
+    with get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            Task.query().filter(priority="high", in_backlog=True).all()
+        finally:
+            conn.set_trace_callback(None)
+    assert len(statements) == 1
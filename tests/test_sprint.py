@@ -1,5 +1,6 @@
 import pytest
-from pyscrum.sprint import Sprint
+from pyscrum.sprint import Sprint, SprintHeader
+from pyscrum.database import get_connection, transaction
 from pyscrum.task import Task
 import sqlite3
 
@@ -163,6 +164,22 @@ def test_sprint_update_name():
     loaded = Sprint.from_name("NewName")
     assert loaded.name == "NewName"
 
+def test_sprint_rename_updates_one_row():
+    s = Sprint("Before Rename")
+    s.add_task(Task("Member"))
+    statements = []
+    with get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            s.update_name("After Rename")
+        finally:
+            conn.set_trace_callback(None)
+    assert not any("sprint_tasks" in sql for sql in statements)
+    loaded = Sprint.from_name_prefix("After")
+    assert loaded.id == s.id
+    assert [t.title for t in loaded.tasks] == ["Member"]
+    assert [t.title for t in Task.query().filter(sprint="After Rename")] == ["Member"]
+
 def test_sprint_from_prefix_unique():
     Sprint.clear_all()
     Sprint("AlphaSprint").save()
@@ -236,6 +253,13 @@ def test_get_tasks_by_status_invalid(clean_sprint):
     assert isinstance(results, list)
     assert len(results) == 0
 
+def test_search_tasks_fuzzy(clean_sprint):
+    clean_sprint.add_task(Task("Deploy to staging"))
+    clean_sprint.add_task(Task("Write release notes"))
+    assert clean_sprint.search_tasks("stagng") == []
+    matches = clean_sprint.search_tasks("stagng", fuzzy=True)
+    assert [task.title for task in matches] == ["Deploy to staging"]
+
 def test_get_tasks_by_priority_none(clean_sprint):
     task = Task("No Priority")
     clean_sprint.add_task(task)
@@ -248,3 +272,105 @@ def test_sprint_database_error_on_load(monkeypatch):
     monkeypatch.setattr("pyscrum.sprint.get_connection", broken_conn)
     with pytest.raises(RuntimeError):
         Sprint.from_name("FailMe")
+
+def test_sprint_list_all_loads_members_without_writes():
+    Sprint.clear_all()
+    task1 = Task("Member 1")
+    task2 = Task("Member 2")
+    task2.set_status("done")
+    alpha = Sprint("Alpha")
+    alpha.add_task(task1)
+    alpha.add_task(task2)
+    alpha.start()
+    Sprint("Beta").save()
+
+    with get_connection() as conn:
+        changes = conn.total_changes
+        sprints = Sprint.list_all()
+        assert conn.total_changes == changes
+
+    assert [s.name for s in sprints] == ["Alpha", "Beta"]
+    assert sprints[0].status == "In Progress"
+    assert [t.title for t in sprints[0].tasks] == ["Member 1", "Member 2"]
+    assert sprints[1].tasks == []
+
+
+def test_sprint_list_all_headers_only():
+    Sprint.clear_all()
+    task = Task("Header task")
+    task.set_status("done")
+    sprint = Sprint("Headers")
+    sprint.add_task(task)
+    sprint.add_task(Task("Open task"))
+    Sprint("Empty").save()
+
+    headers = Sprint.list_all(headers_only=True)
+    assert headers[0] == SprintHeader("Headers", "Planned", 2, 1, 0, 1)
+    assert headers[1] == SprintHeader("Empty", "Planned", 0, 0, 0, 0)
+
+
+def test_sprint_tasks_are_loaded_lazily(monkeypatch):
+    sprint = Sprint("Lazy")
+    task = Task("Lazy task")
+    sprint.add_task(task)
+
+    loads = []
+    original = Sprint._member_rows
+    monkeypatch.setattr(Sprint, "_member_rows", lambda self, conn: loads.append(1) or original(self, conn))
+
+    loaded = Sprint.from_name("Lazy")
+    assert loaded.status == "Planned"
+    assert loads == []
+    assert [t.id for t in loaded.tasks] == [task.id]
+    assert [t.id for t in loaded.tasks] == [task.id]
+    assert loads == [1]
+
+
+def test_sprint_save_writes_only_changes():
+    sprint = Sprint("Delta")
+    with transaction():
+        for i in range(50):
+            sprint.add_task(Task(f"Delta {i}"))
+    new_task = Task("One more")
+
+    statements = []
+    with get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            sprint.add_task(new_task)
+            sprint.save()
+        finally:
+            conn.set_trace_callback(None)
+    links = [s for s in statements if "sprint_tasks" in s]
+    assert len(links) == 1
+
+    sprint.remove_task(new_task)
+    assert len(Sprint.from_name("Delta").tasks) == 50
+
+
+def test_sprint_save_after_rolled_back_add():
+    sprint = Sprint("Rolled Back")
+    first, second = Task("First"), Task("Second")
+    with pytest.raises(RuntimeError):
+        with transaction():
+            sprint.add_task(first)
+            raise RuntimeError
+    assert not Sprint.exists("Rolled Back")
+
+    sprint.add_task(second)
+    assert Sprint.exists("Rolled Back")
+    assert [t.title for t in Sprint.from_name("Rolled Back").tasks] == ["First", "Second"]
+
+
+def test_stale_sprint_never_writes_to_another_sprint():
+    old = Sprint("Old")
+    old.add_task(Task("Kept"))
+    old_id = old.id
+    Sprint.delete("Old")
+    old.add_task(Task("Ghost"))
+    fresh = Sprint("Fresh")
+    fresh.save()
+
+    assert fresh.id > old_id and old.id > old_id
+    assert Sprint.from_name("Fresh").tasks == []
+    assert [t.title for t in Sprint.from_name("Old").tasks] == ["Kept", "Ghost"]
@@ -1,5 +1,5 @@
 import pytest
-from pyscrum.task import Task
+from pyscrum.task import Task, ROW_FIELDS
 
 
 def test_task_creation():
@@ -29,6 +29,73 @@ def test_task_search():
     assert len(results) == 2
 
 
+def test_task_search_ranked():
+    Task("Fix login page", "Users cannot sign in")
+    Task("Write docs", "Explain the login flow", priority="high")
+    Task("Refactor", "Nothing related")
+
+    hits = Task.search_ranked("login")
+    assert [hit.task.title for hit in hits] == ["Fix login page", "Write docs"]
+    assert hits[0].score <= hits[1].score
+    assert "[login]" in hits[1].snippet
+
+    assert [h.task.title for h in Task.search_ranked("log")] == ["Fix login page", "Write docs"]
+    assert Task.search_ranked("log", prefix=False) == []
+    assert [h.task.title for h in Task.search_ranked("login", priority="high")] == ["Write docs"]
+    assert [h.task.title for h in Task.search_ranked("login flow", phrase=True)] == ["Write docs"]
+    assert Task.search_ranked("flow login", phrase=True) == []
+
+
+def test_task_search_index_follows_updates():
+    task = Task("Old title")
+    task.title = "Brand new title"
+    task.save()
+    assert Task.search("old") == []
+    assert [t.id for t in Task.search("brand")] == [task.id]
+    Task.clear_all()
+    assert Task.search("brand") == []
+
+
+def test_task_search_without_fts_falls_back_to_like():
+    from pyscrum.database import get_connection
+
+    Task("Fix login page", "Users cannot sign in")
+    with get_connection() as conn:
+        conn.execute("DROP TABLE tasks_fts")
+        for trigger in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER tasks_fts_{trigger}")
+    Task("Login audit")
+
+    assert len(Task.search("ogin")) == 2
+    hits = Task.search_ranked("login page")
+    assert [hit.task.title for hit in hits] == ["Fix login page"]
+    assert hits[0].score is None
+
+
+def test_task_fuzzy_search_tolerates_typos():
+    Task("Fix login page")
+    Task("Update billing address")
+    Task("Logout button")
+
+    hits = Task.fuzzy_search("lgoin page")
+    assert hits[0].task.title == "Fix login page"
+    assert 0 < hits[0].similarity <= 1
+    assert [t.title for t in Task.search("adress", fuzzy=True)] == ["Update billing address"]
+    assert Task.fuzzy_search("zzzz") == []
+    assert len(Task.fuzzy_search("o", limit=1, threshold=0)) == 1
+
+
+def test_task_fuzzy_search_without_trigram_index():
+    from pyscrum.database import get_connection
+
+    Task("Update billing address")
+    with get_connection() as conn:
+        conn.execute("DROP TABLE tasks_trigram")
+        for trigger in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER tasks_trigram_{trigger}")
+    assert [h.task.title for h in Task.fuzzy_search("biling")] == ["Update billing address"]
+
+
 def test_task_list_all():
     # Clear existing tasks first
     Task.clear_all()  # Add this method if it doesn't exist
@@ -50,6 +117,126 @@ def test_task_load_by_prefix():
     assert loaded.id == task.id
 
 
+def _insert_tasks(*task_ids):
+    from pyscrum.database import get_connection
+
+    with get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO tasks (id, title, description, status, priority, created_at) "
+            "VALUES (?, ?, '', 'todo', 'medium', '2024-01-01T00:00:00')",
+            [(task_id, task_id) for task_id in task_ids],
+        )
+
+
+def test_task_load_by_prefix_uses_id_range():
+    _insert_tasks("abc123", "abd456")
+    assert Task.load_by_prefix("ABC").id == "abc123"
+    assert Task.load_by_prefix("abd4").id == "abd456"
+    with pytest.raises(ValueError):
+        Task.load_by_prefix("abe")
+
+
+def test_task_time_ordered_ids():
+    from pyscrum import ids
+    from pyscrum.database import set_id_strategy
+
+    set_id_strategy("ulid")
+    first = Task("First")
+    handles = Task.bulk_create(["Second", "Third"])
+    task_ids = [first.id] + [handle.id for handle in handles]
+    assert task_ids == sorted(task_ids) and len(first.id) == 26
+    assert Task.load_by_prefix(handles[1].id.upper()).title == "Third"
+    assert ids.new_id("uuid7", millis=1) < ids.new_id("uuid7", millis=2)
+    # IDs from one millisecond differ right after the timestamp, not at the end
+    batch = [ids.ulid(millis=1) for _ in range(3)]
+    assert batch == sorted(batch) and len({task_id[:13] for task_id in batch}) == 3
+    assert max(len(short) for short in Task.short_ids().values()) <= 13
+    with pytest.raises(ValueError):
+        set_id_strategy("serial")
+
+
+def test_task_short_ids():
+    _insert_tasks("abc111", "abc122", "abd000")
+    assert Task.short_ids() == {"abc111": "abc11", "abc122": "abc12", "abd000": "abd"}
+    assert Task.short_ids(min_length=5)["abd000"] == "abd00"
+    assert Task.load_by_prefix("abc12").id == "abc122"
+
+
+def test_task_iter_all_pages_with_keyset_cursor():
+    Task.bulk_create([f"Page {i}" for i in range(7)])
+    everything = [t.id for t in Task.iter_all(batch_size=2)]
+    assert len(everything) == 7
+    assert [t.id for t in Task.load_all()] == everything
+
+    first = Task.list_all(limit=3)
+    second = Task.list_all(after=first[-1].id, limit=3)
+    rest = Task.list_all(after=second[-1].id)
+    assert [t.id for t in first + second + rest] == everything
+    assert len(rest) == 1
+
+    Task.bulk_update(everything[::2], status="done")
+    done = Task.list_all(status="done", after=everything[0], limit=2)
+    assert [t.id for t in done] == everything[2:6:2]
+    with pytest.raises(ValueError):
+        Task.list_all(after="missing")
+
+
+def test_task_has_no_instance_dict():
+    task = Task("Slotted")
+    assert not hasattr(task, "__dict__")
+    task.tags = ["ui"]
+    assert Task.load(task.id).priority == "medium"
+    with pytest.raises(AttributeError):
+        task.colour = "red"
+
+
+def test_task_rows_fetch_only_requested_columns():
+    task = Task("Projected", "long description " * 50)
+    row, = Task.list_all(fields=("title",))
+    assert row.title == "Projected" and row.id == task.id
+    assert row.description is None
+    assert str(Task.list_all(fields=ROW_FIELDS)[0]) == repr(Task.load(task.id))
+    with pytest.raises(AttributeError):
+        row.title = "changed"
+
+    row, = Task.query().filter(text="long").rows("description")
+    assert row.description.startswith("long description") and row.title is None
+    with pytest.raises(ValueError):
+        Task.query().rows("secret")
+
+
+def test_task_description_is_loaded_on_access():
+    from pyscrum.database import get_connection
+
+    Task.bulk_create([{"title": f"Deferred {i}", "description": f"details {i}"} for i in range(3)])
+    statements = []
+    with get_connection() as conn:
+        tasks = Task.list_all()
+        conn.set_trace_callback(statements.append)
+        try:
+            assert [t.title for t in tasks] == ["Deferred 0", "Deferred 1", "Deferred 2"]
+            assert statements == []
+            assert tasks[0].description == "details 0"
+            Task.prefetch_descriptions(tasks)
+            assert [t.description for t in tasks] == ["details 0", "details 1", "details 2"]
+        finally:
+            conn.set_trace_callback(None)
+    assert len(statements) == 2  # one lazy fetch, one batch for the other two
+
+
+def test_task_deferred_description_can_be_changed():
+    task = Task("Deferred write", "old")
+    loaded = Task.list_all()[0]
+    loaded.description = "new"
+    loaded.save()
+    assert Task.load(task.id).description == "new"
+
+    copy = Task.list_all()[0]
+    copy.id = "copied-task"
+    copy.save()
+    assert Task.load("copied-task").description == "new"
+
+
 def test_task_update_description():
     task = Task("Description Test")
     task.update_description("New Description")
@@ -62,3 +249,193 @@ def test_task_set_priority():
     assert task.priority == "high"
     with pytest.raises(ValueError):
         task.set_priority("invalid")
+
+
+def _task_count():
+    from pyscrum.database import get_connection
+    with get_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+
+def test_task_load_does_not_write():
+    task = Task("Loaded", "Body", "high")
+    task.set_status("done")
+    loaded = Task.load(task.id)
+    assert (loaded.id, loaded.title, loaded.status, loaded.priority) == (task.id, "Loaded", "done", "high")
+    assert loaded.created_at == task.created_at
+    assert _task_count() == 1
+
+
+def test_task_purge_phantoms():
+    from pyscrum.backlog import Backlog
+    from pyscrum.database import get_connection
+    original = Task("Original", "Body")
+    Backlog().add_task(original)
+    # What the old Task.load left behind: an unreferenced, newer twin.
+    phantom = Task("Original", "Body")
+    Task("Unrelated")
+    # Real duplicates: bulk-created twins and a twin saved again later.
+    Task.bulk_create(["Write tests", "Write tests"])
+    edited = Task("Original", "Body")
+    with get_connection() as conn:
+        conn.execute(
+            "UPDATE tasks SET updated_at = '2999-01-01T00:00:00' WHERE id = ?", (edited.id,)
+        )
+
+    assert Task.purge_phantoms() == [phantom.id]
+    assert _task_count() == 6
+    assert Task.purge_phantoms(dry_run=False) == [phantom.id]
+    assert _task_count() == 5
+    assert Task.load(original.id).title == "Original"
+
+
+def test_task_load_many():
+    from pyscrum.database import transaction
+    with transaction():
+        tasks = [Task(f"Many {i}") for i in range(1000)]
+    ids = [t.id for t in reversed(tasks)] + ["missing-id", tasks[0].id]
+    loaded = Task.load_many(ids)
+    assert [t.id for t in loaded] == [t.id for t in reversed(tasks)]
+    assert Task.load_many([]) == []
+
+
+def test_task_bulk_create_streams_records():
+    records = ({"title": f"Bulk {i}", "priority": "high"} for i in range(2500))
+    handles = Task.bulk_create(records)
+    assert len(handles) == 2500
+    assert handles[0].title == "Bulk 0"
+    assert Task.load(handles[-1].id).priority == "high"
+    assert _task_count() == 2500
+
+
+def test_task_bulk_create_is_atomic():
+    with pytest.raises(ValueError):
+        Task.bulk_create(["Fine", {"title": "Broken", "priority": "urgent"}])
+    assert _task_count() == 0
+
+
+def test_task_bulk_update_by_ids_and_filter():
+    handles = Task.bulk_create([f"Close {i}" for i in range(5)])
+    ids = [h.id for h in handles]
+    assert Task.bulk_update(ids[:3], status="in_progress") == 3
+    assert Task.bulk_update({"status": "in_progress"}, status="done", priority="low") == 3
+    done = Task.list_all(status="done")
+    assert sorted(t.id for t in done) == sorted(ids[:3])
+    assert all(t.priority == "low" for t in done)
+
+    with pytest.raises(ValueError):
+        Task.bulk_update(ids, status="blocked")
+    with pytest.raises(ValueError):
+        Task.bulk_update({"title": "x"}, status="done")
+    with pytest.raises(ValueError):
+        Task.bulk_update(ids)
+
+
+def test_task_save_writes_only_changes():
+    task = Task("Dirty", "Long description")
+    loaded = Task.load(task.id)
+    before = Task.write_stats()
+
+    loaded.save()
+    loaded.set_status("todo")  # unchanged value
+    statements = []
+    from pyscrum.database import get_connection
+    with get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            loaded.set_priority("high")
+        finally:
+            conn.set_trace_callback(None)
+
+    after = Task.write_stats()
+    assert after["skipped"] - before["skipped"] == 2
+    assert after["updates"] - before["updates"] == 1
+    updates = [s for s in statements if "UPDATE tasks" in s]
+    assert len(updates) == 1
+    assert "priority = " in updates[0] and "description" not in updates[0]
+    reloaded = Task.load(task.id)
+    assert (reloaded.priority, reloaded.description) == ("high", "Long description")
+
+
+@pytest.fixture
+def task_cache():
+    Task.configure_cache(maxsize=16)
+    yield
+    Task.configure_cache(maxsize=0)
+
+
+def test_task_cache_hits_and_write_through(task_cache):
+    task = Task("Cached")
+    Task.load(task.id)
+    Task.load_by_prefix(task.id[:5])
+    Task.load_by_prefix(task.id[:5])
+    stats = Task.cache_stats()
+    assert stats["hits"] >= 1 and stats["size"] == 2
+
+    task.set_status("done")
+    assert Task.load(task.id).status == "done"
+    Task.bulk_update([task.id], priority="low")
+    assert Task.load_by_prefix(task.id[:5]).priority == "low"
+
+
+def test_task_save_after_rollback_writes_again():
+    from pyscrum.database import transaction
+    task = Task("Retry")
+    with pytest.raises(RuntimeError):
+        with transaction():
+            task.set_status("done")
+            with pytest.raises(KeyError):
+                with transaction():
+                    task.set_priority("high")
+                    raise KeyError
+            raise RuntimeError
+    assert Task.load(task.id).status == "todo"
+    task.save()
+    stored = Task.load(task.id)
+    assert (stored.status, stored.priority) == ("done", "high")
+
+    with pytest.raises(RuntimeError):
+        with transaction():
+            new = Task("Never committed")
+            raise RuntimeError
+    new.save()
+    assert Task.load(new.id).title == "Never committed"
+
+
+def test_task_cache_skips_rolled_back_reads(task_cache):
+    from pyscrum.database import transaction
+    task = Task("Rolled back")
+    with pytest.raises(RuntimeError):
+        with transaction():
+            task.set_status("done")
+            assert Task.load(task.id).status == "done"
+            assert Task.load_by_prefix(task.id[:8]).status == "done"
+            raise RuntimeError
+    assert Task.load(task.id).status == "todo"
+    assert Task.load_by_prefix(task.id[:8]).status == "todo"
+
+
+def test_task_cache_sees_other_connections(task_cache):
+    import sqlite3
+    from pyscrum import database
+    task = Task("Shared file")
+    assert Task.load(task.id).title == "Shared file"
+
+    other = sqlite3.connect(database.DB_NAME)
+    other.execute("UPDATE tasks SET title = 'Changed elsewhere' WHERE id = ?", (task.id,))
+    other.commit()
+    other.close()
+
+    assert Task.load(task.id).title == "Changed elsewhere"
+
+
+def test_task_cache_ttl_and_size():
+    from pyscrum.cache import LRUCache
+    cache = LRUCache(maxsize=2, ttl=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    cache.ttl = None
+    for key in "abc":
+        cache.put(key, key)
+    assert cache.get("a") is None and cache.get("c") == "c"
+    assert cache.stats()["size"] == 2